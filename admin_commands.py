@@ -9,17 +9,16 @@ from discord.ext import commands
 logger = logging.getLogger(__name__)
 
 
+# Resolved once at import; the env is loaded by bot.py before extensions are imported
+try:
+    _OWNER_ID: Optional[int] = int(os.getenv("BOT_OWNER_ID") or 0) or None
+except ValueError:
+    _OWNER_ID = None
+
+
 def owner_only_check():
     async def predicate(interaction: Interaction) -> bool:
-        owner_env = os.getenv("BOT_OWNER_ID")
-        try:
-            owner_id = int(owner_env) if owner_env else None
-        except Exception:
-            owner_id = None
-        try:
-            return getattr(interaction.user, "id", None) == owner_id
-        except Exception:
-            return False
+        return getattr(interaction.user, "id", None) == _OWNER_ID
 
     return app_commands.check(predicate)
 
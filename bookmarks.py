@@ -1,7 +1,12 @@
 import os
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiosqlite
 import discord
@@ -11,6 +16,87 @@ from discord.ext import commands
 logger = logging.getLogger(__name__)
 
 DB_PATH = "data/news.db"
+# Applied once when the shared connection opens: WAL turns each commit into an append
+# instead of a page rewrite; mmap/cache are kept modest (256 MB / 64 MB)
+DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+BOOKMARK_CACHE_SIZE = 4096  # max (user_id, entry_id) membership facts kept in memory
+WRITE_BATCH_MAX = 64        # max queued bookmark writes committed together
+WRITE_BATCH_WINDOW = 0.01   # seconds to wait for more writes before committing
+WRITER_STOP_TIMEOUT = 10    # seconds cog_unload waits for queued writes to commit
+DELETE_CHUNK_SIZE = 500     # entry_ids per DELETE ... IN (...) statement
+
+# Timestamps (posted_at, added_at) are INTEGER unix-millis
+SQL_CREATE_NEWS_ENTRIES = """
+    CREATE TABLE IF NOT EXISTS news_entries (
+        entry_id TEXT PRIMARY KEY,
+        source TEXT,
+        source_entry_id TEXT,
+        url TEXT NOT NULL UNIQUE,
+        title TEXT NOT NULL,
+        summary TEXT,
+        content TEXT,
+        image_url TEXT,
+        published_at INTEGER,
+        posted_at INTEGER,
+        extra_json TEXT
+    )
+"""
+SQL_CREATE_BOOKMARKS = """
+    CREATE TABLE IF NOT EXISTS bookmarks (
+        user_id INTEGER,
+        entry_id TEXT,
+        added_at INTEGER,
+        note TEXT,
+        PRIMARY KEY (user_id, entry_id),
+        FOREIGN KEY (entry_id) REFERENCES news_entries(entry_id) ON DELETE RESTRICT
+    )
+"""
+
+# Statements reused on every interaction; sqlite3 keeps them prepared in its statement cache
+SQL_INSERT_ENTRY = (
+    "INSERT OR IGNORE INTO news_entries (entry_id, url, title, image_url, summary, posted_at, extra_json) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_ENTRY_EXISTS_IN = "SELECT entry_id FROM news_entries WHERE entry_id IN"
+SQL_UPSERT_BM = "INSERT OR REPLACE INTO bookmarks (user_id, entry_id, added_at, note) VALUES (?, ?, ?, ?)"
+SQL_DEL_BM = "DELETE FROM bookmarks WHERE user_id = ? AND entry_id = ?"
+SQL_DEL_BM_MANY = "DELETE FROM bookmarks WHERE user_id = ? AND entry_id IN"
+SQL_EXISTS_BM = "SELECT 1 FROM bookmarks WHERE user_id = ? AND entry_id = ?"
+SQL_GET_ENTRY = "SELECT entry_id, title, url, summary, image_url FROM news_entries WHERE entry_id = ?"
+
+PUBLIC_BUTTON_PREFIX = "bm:manage:"  # custom_id prefix of the persistent public button
+SQL_LIST_BM = """
+    SELECT b.entry_id, n.title, n.url, n.summary, n.image_url, b.added_at, n.published_at
+    FROM bookmarks b
+    LEFT JOIN news_entries n ON b.entry_id = n.entry_id
+    WHERE b.user_id = ?
+    ORDER BY b.added_at DESC
+    LIMIT ? OFFSET ?
+"""
+SQL_COUNT_BM = "SELECT COUNT(*) FROM bookmarks WHERE user_id = ?"
+# Article bodies are only needed for the selected bookmark, never for the list
+SQL_BM_CONTENT = """
+    SELECT n.content
+    FROM bookmarks b
+    JOIN news_entries n ON b.entry_id = n.entry_id
+    WHERE b.user_id = ? AND b.entry_id = ?
+"""
+
+
+def _format_added_at(value: Any) -> str:
+    """Render an added_at unix-millis value for display."""
+    if not value:
+        return ''
+    try:
+        return datetime.fromtimestamp(int(value) / 1000).strftime("%d/%m/%Y %H:%M")
+    except (TypeError, ValueError, OverflowError, OSError):
+        return str(value)
 
 
 class BookmarkManager(commands.Cog):
@@ -18,47 +104,107 @@ class BookmarkManager(commands.Cog):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
+        self.db: Optional[aiosqlite.Connection] = None
+        # Serializes write transactions on the shared connection
+        self._write_lock = asyncio.Lock()
+        # LRU of (user_id, entry_id) -> bookmarked, kept in sync by add/remove
+        self._bm_cache: "OrderedDict[Tuple[int, str], bool]" = OrderedDict()
+        # Bookmark writes are queued and committed in small batches by _write_loop
+        self._write_q: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
 
     async def cog_load(self):
         await self._init_db()
+        self._writer_task = asyncio.create_task(self._write_loop())
         logger.info("🔖 Gestionnaire de favoris chargé")
 
+    async def cog_unload(self):
+        task, self._writer_task = self._writer_task, None
+        if task and not task.done():
+            # None asks the writer to commit everything queued before it, then exit
+            await self._write_q.put(None)
+            try:
+                await asyncio.wait_for(task, WRITER_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning("Bookmark writer did not finish in time; pending writes were cancelled")
+            except Exception:
+                logger.exception("Bookmark writer failed while stopping")
+        # Close the shared connection opened in _init_db
+        if self.db is not None:
+            await self.db.close()
+            self.db = None
+
     async def _init_db(self) -> None:
         os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
-        async with aiosqlite.connect(DB_PATH) as db:
-            # news_entries: canonical storage for posted news
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS news_entries (
-                    entry_id TEXT PRIMARY KEY,
-                    source TEXT,
-                    source_entry_id TEXT,
-                    url TEXT NOT NULL UNIQUE,
-                    title TEXT NOT NULL,
-                    summary TEXT,
-                    content TEXT,
-                    image_url TEXT,
-                    published_at INTEGER,
-                    posted_at TEXT,
-                    extra_json TEXT
-                )
-            """)
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_news_published_at ON news_entries (published_at)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_news_source ON news_entries (source)")
-
-            # bookmarks: per-user references to news_entries
-            await db.execute("""
-                CREATE TABLE IF NOT EXISTS bookmarks (
-                    user_id INTEGER,
-                    entry_id TEXT,
-                    added_at TEXT,
-                    note TEXT,
-                    PRIMARY KEY (user_id, entry_id),
-                    FOREIGN KEY (entry_id) REFERENCES news_entries(entry_id) ON DELETE RESTRICT
+        # One connection for the cog's lifetime: avoids a worker thread + file open per button click
+        self.db = await aiosqlite.connect(DB_PATH, cached_statements=256)
+        self.db.row_factory = aiosqlite.Row
+        db = self.db
+        for pragma in DB_PRAGMAS:
+            await db.execute(pragma)
+
+        # Legacy databases stored posted_at/added_at as ISO TEXT; convert before (re)creating indexes
+        await self._migrate_epoch_columns(db)
+
+        # news_entries: canonical storage for posted news
+        await db.execute(SQL_CREATE_NEWS_ENTRIES)
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_news_published_at ON news_entries (published_at)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_news_source ON news_entries (source)")
+
+        # bookmarks: per-user references to news_entries
+        await db.execute(SQL_CREATE_BOOKMARKS)
+        # (user_id, added_at DESC) serves the newest-first list query without a temp sort;
+        # it also covers user_id lookups, so the old single-column index is redundant
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_user_added ON bookmarks (user_id, added_at DESC)")
+        await db.execute("DROP INDEX IF EXISTS idx_bookmarks_user")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_entry ON bookmarks (entry_id)")
+        await db.commit()
+
+    async def _migrate_epoch_columns(self, db: aiosqlite.Connection) -> None:
+        """Rebuild tables whose timestamp column is still declared TEXT so it holds INTEGER unix-millis."""
+        to_migrate = []
+        for table, column, create_sql in (
+            ("news_entries", "posted_at", SQL_CREATE_NEWS_ENTRIES),
+            ("bookmarks", "added_at", SQL_CREATE_BOOKMARKS),
+        ):
+            async with db.execute(f"PRAGMA table_info({table})") as cursor:
+                declared = {r["name"]: (r["type"] or "").upper() for r in await cursor.fetchall()}
+            if declared.get(column) == "TEXT":
+                to_migrate.append((table, column, create_sql, list(declared)))
+        if not to_migrate:
+            return
+
+        # Keep foreign keys pointing at the real table names while tables are renamed
+        await db.execute("PRAGMA legacy_alter_table=ON")
+        try:
+            await db.execute("BEGIN")
+            for table, column, create_sql, columns in to_migrate:
+                legacy = f"{table}_legacy"
+                await db.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+                await db.execute(create_sql)
+                select_cols = [
+                    f"CASE WHEN typeof({c}) = 'text' THEN CAST(strftime('%s', {c}, 'utc') AS INTEGER) * 1000 ELSE {c} END"
+                    if c == column else c
+                    for c in columns
+                ]
+                await db.execute(
+                    f"INSERT INTO {table} ({', '.join(columns)}) SELECT {', '.join(select_cols)} FROM {legacy}"
                 )
-            """)
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_user ON bookmarks (user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_bookmarks_entry ON bookmarks (entry_id)")
+                await db.execute(f"DROP TABLE {legacy}")
             await db.commit()
+            logger.info("🔖 Horodatages des favoris migrés en epoch (ms)")
+        except Exception:
+            await db.rollback()
+            raise
+        finally:
+            await db.execute("PRAGMA legacy_alter_table=OFF")
+
+    def _cache_set(self, user_id: int, entry_id: str, value: bool) -> None:
+        key = (user_id, str(entry_id))
+        self._bm_cache[key] = value
+        self._bm_cache.move_to_end(key)
+        if len(self._bm_cache) > BOOKMARK_CACHE_SIZE:
+            self._bm_cache.popitem(last=False)
 
     async def add_bookmark(
         self,
@@ -69,88 +215,218 @@ class BookmarkManager(commands.Cog):
         feed_title: Optional[str] = None,
         image_url: Optional[str] = None,
     ) -> bool:
+        now_ms = time.time_ns() // 1_000_000  # one clock read shared by both rows
+        entry_row = (str(entry_id), url or '', title or '', image_url, None, now_ms, None)
+        bm_row = (user_id, str(entry_id), now_ms, None)
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                # Ensure a minimal news_entries row exists for this entry_id so we can later join and display full content
-                try:
-                    await db.execute(
-                        "INSERT OR IGNORE INTO news_entries (entry_id, url, title, image_url, summary, posted_at, extra_json) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                        (
-                            str(entry_id),
-                            url or '',
-                            title or '',
-                            image_url,
-                            None,
-                            datetime.now().isoformat(),
-                            None,
-                        ),
-                    )
-                except Exception:
-                    logger.debug("Could not ensure news_entries row for bookmark; proceeding")
-
-                await db.execute(
-                    "INSERT OR REPLACE INTO bookmarks (user_id, entry_id, added_at, note) VALUES (?, ?, ?, ?)",
-                    (user_id, str(entry_id), datetime.now().isoformat(), None),
-                )
-                await db.commit()
-                return True
+            await self._submit_write("add", (entry_row, bm_row))
+            self._cache_set(user_id, entry_id, True)
+            return True
         except Exception as e:
             logger.error(f"Error adding bookmark: {e}")
             return False
 
     async def remove_bookmark(self, user_id: int, entry_id: str) -> bool:
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                await db.execute("DELETE FROM bookmarks WHERE user_id = ? AND entry_id = ?", (user_id, str(entry_id)))
-                await db.commit()
-                return True
+            await self._submit_write("remove", (user_id, str(entry_id)))
+            self._cache_set(user_id, entry_id, False)
+            return True
         except Exception as e:
             logger.error(f"Error removing bookmark: {e}")
             return False
 
+    async def remove_bookmarks(self, user_id: int, entry_ids: List[str]) -> bool:
+        """Remove several bookmarks for a user in a single transaction."""
+        ids = list(dict.fromkeys(str(e) for e in entry_ids))
+        if not ids:
+            return True
+        try:
+            db = self.db
+            async with self._write_lock:
+                await db.execute("BEGIN")
+                try:
+                    # Stay well below SQLite's bound-parameter limit (999 on older builds)
+                    for i in range(0, len(ids), DELETE_CHUNK_SIZE):
+                        chunk = ids[i:i + DELETE_CHUNK_SIZE]
+                        placeholders = ", ".join("?" * len(chunk))
+                        await db.execute(f"{SQL_DEL_BM_MANY} ({placeholders})", (user_id, *chunk))
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            for entry_id in ids:
+                self._cache_set(user_id, entry_id, False)
+            return True
+        except Exception as e:
+            logger.error(f"Error removing bookmarks: {e}")
+            return False
+
+    # --- Write batching -------------------------------------------------
+    async def _submit_write(self, kind: str, payload: Any) -> None:
+        """Queue a write for the batch writer and wait until its transaction commits."""
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._write_loop())
+        fut = asyncio.get_running_loop().create_future()
+        await self._write_q.put((kind, payload, fut))
+        await fut
+
+    async def _write_loop(self) -> None:
+        """Drain the write queue, grouping bursts of clicks into a single transaction."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._write_q.get()
+            if first is None:
+                return
+            batch = [first]
+            try:
+                deadline = loop.time() + WRITE_BATCH_WINDOW
+                while len(batch) < WRITE_BATCH_MAX:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._write_q.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if item is None:
+                        # Stop requested: commit this last batch, then exit
+                        stopping = True
+                        break
+                    batch.append(item)
+                await self._flush_writes(batch)
+            except asyncio.CancelledError:
+                # Cancelled (unload timed out): don't leave callers waiting on writes that will never run
+                for _, _, fut in batch:
+                    fut.cancel()
+                while not self._write_q.empty():
+                    item = self._write_q.get_nowait()
+                    if item is not None:
+                        item[2].cancel()
+                raise
+            except Exception as e:
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(e)
+            else:
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_result(None)
+
+    async def _flush_writes(self, batch: List[Tuple[str, Any, "asyncio.Future"]]) -> None:
+        db = self.db
+        async with self._write_lock:
+            # The whole batch shares one transaction: a single journal flush for every queued click
+            await db.execute("BEGIN")
+            try:
+                # Consecutive runs of the same kind keep add/remove ordering intact
+                for kind, ops in groupby(batch, key=itemgetter(0)):
+                    payloads = [op[1] for op in ops]
+                    if kind == "add":
+                        await self._insert_missing_entries(db, [p[0] for p in payloads])
+                        await db.executemany(SQL_UPSERT_BM, [p[1] for p in payloads])
+                    elif kind == "remove":
+                        await db.executemany(SQL_DEL_BM, payloads)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def _insert_missing_entries(self, db: aiosqlite.Connection, entry_rows: List[tuple]) -> None:
+        """Ensure a minimal news_entries row exists for each bookmarked entry so we can later join and display full content.
+
+        The poster usually stored it already, so probe with a read before attempting a write.
+        """
+        try:
+            ids = list({row[0] for row in entry_rows})
+            placeholders = ", ".join("?" * len(ids))
+            async with db.execute(f"{SQL_ENTRY_EXISTS_IN} ({placeholders})", ids) as cursor:
+                existing = {r[0] for r in await cursor.fetchall()}
+            missing = [row for row in entry_rows if row[0] not in existing]
+            if missing:
+                await db.executemany(SQL_INSERT_ENTRY, missing)
+        except Exception:
+            logger.debug("Could not ensure news_entries row for bookmark; proceeding")
+
     async def is_bookmarked(self, user_id: int, entry_id: str) -> bool:
+        key = (user_id, str(entry_id))
+        cached = self._bm_cache.get(key)
+        if cached is not None:
+            self._bm_cache.move_to_end(key)
+            return cached
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute("SELECT 1 FROM bookmarks WHERE user_id = ? AND entry_id = ?", (user_id, str(entry_id))) as cursor:
-                    return bool(await cursor.fetchone())
+            db = self.db
+            async with db.execute(SQL_EXISTS_BM, key) as cursor:
+                found = bool(await cursor.fetchone())
+            self._cache_set(user_id, entry_id, found)
+            return found
         except Exception as e:
             logger.error(f"Error checking bookmark: {e}")
             return False
 
     async def get_user_bookmarks(self, user_id: int) -> List[Dict[str, Any]]:
+        # LIMIT -1 means "no limit" in SQLite
+        return await self.get_user_bookmarks_page(user_id, 0, -1)
+
+    async def get_user_bookmarks_page(self, user_id: int, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Return one page of a user's bookmarks, newest first."""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                # Join bookmarks with canonical news_entries for display
-                async with db.execute(
-                    """
-                    SELECT b.entry_id, n.title, n.url, n.summary, n.content, n.image_url, b.added_at, n.published_at
-                    FROM bookmarks b
-                    LEFT JOIN news_entries n ON b.entry_id = n.entry_id
-                    WHERE b.user_id = ?
-                    ORDER BY b.added_at DESC
-                    """,
-                    (user_id,),
-                ) as cursor:
-                    rows = await cursor.fetchall()
-                    cols = [c[0] for c in cursor.description]
-                    return [dict(zip(cols, r)) for r in rows]
+            db = self.db
+            # Join bookmarks with canonical news_entries for display
+            async with db.execute(SQL_LIST_BM, (user_id, limit, offset)) as cursor:
+                bookmarks = [dict(r) for r in await cursor.fetchall()]
+            # Every listed entry is bookmarked: seed the cache so follow-up clicks skip the DB
+            for bm in bookmarks:
+                self._cache_set(user_id, bm['entry_id'], True)
+            return bookmarks
         except Exception as e:
             logger.error(f"Error getting user bookmarks: {e}")
             return []
 
+    async def count_user_bookmarks(self, user_id: int) -> int:
+        try:
+            async with self.db.execute(SQL_COUNT_BM, (user_id,)) as cursor:
+                row = await cursor.fetchone()
+            return int(row[0]) if row else 0
+        except Exception as e:
+            logger.error(f"Error counting user bookmarks: {e}")
+            return 0
+
+    async def get_bookmark_detail(self, user_id: int, entry_id: str) -> Optional[str]:
+        """Return the stored article content for one of the user's bookmarks, or None."""
+        try:
+            async with self.db.execute(SQL_BM_CONTENT, (user_id, str(entry_id))) as cursor:
+                row = await cursor.fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error getting bookmark detail: {e}")
+            return None
+
+    async def get_entry(self, entry_id: str) -> Optional[Dict[str, Any]]:
+        """Return the stored news_entries row for entry_id, or None."""
+        try:
+            async with self.db.execute(SQL_GET_ENTRY, (str(entry_id),)) as cursor:
+                row = await cursor.fetchone()
+            return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Error getting news entry: {e}")
+            return None
+
     async def handle_bookmarks(self, interaction: Interaction):
         """Handler called by the top-level /news favoris wrapper (always ephemeral)."""
         await interaction.response.defer(ephemeral=True)
         try:
             user_id = interaction.user.id
-            bms = await self.get_user_bookmarks(user_id)
-            if not bms:
+            total = await self.count_user_bookmarks(user_id)
+            if not total:
                 embed = discord.Embed(title="🔖 Vos favoris", description="Vous n'avez aucun favoris.", color=0x2F3136)
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
 
-            view = BookmarksListPanelView(bms, self)
-            page_embed = view.build_page_embed(0)
+            page_size = BookmarksListPanelView.PAGE_SIZE
+            first_page = await self.get_user_bookmarks_page(user_id, 0, page_size)
+            view = BookmarksListPanelView(first_page, total, self, user_id, page_size=page_size)
+            page_embed = view.build_page_embed()
             await interaction.followup.send(embed=page_embed, view=view, ephemeral=True)
         except Exception as e:
             logger.error(f"Error in /news favoris: {e}")
@@ -160,25 +436,45 @@ class BookmarkManager(commands.Cog):
                 pass
 
     # --- UI helpers -------------------------------------------------
+    async def _open_personal_panel(self, interaction: Interaction, entry: Dict[str, Any]) -> None:
+        """Reply with an ephemeral per-user panel showing either Ajouter or Retirer for this entry."""
+        user_id = interaction.user.id
+        entry_id = self.canonical_entry_id_from_entry(entry)
+        title = entry.get('title') or entry.get('url') or 'Article'
+        try:
+            is_bm = await self.is_bookmarked(user_id, entry_id)
+            pv = PersonalBookmarkView(entry, self, user_id, is_bm)
+            if is_bm:
+                msg = f"🔖 **{title}** est déjà dans vos favoris."
+            else:
+                msg = f"🔖 **{title}** n'est pas encore dans vos favoris."
+            await interaction.response.send_message(msg, view=pv, ephemeral=True)
+        except Exception as e:
+            logger.error(f"Error opening personal bookmark panel: {e}")
+            await interaction.response.send_message("❌ Erreur lors de l'opération de favoris.", ephemeral=True)
+
     def make_entry_view(self, entry: Dict[str, Any]) -> Optional[discord.ui.View]:
         """Return a per-entry view (opens an ephemeral per-user manager on click)."""
         try:
-            return EntryBookmarkView(entry, self)
+            return PublicBookmarkView(entry, self)
         except Exception as e:
             logger.error(f"Error building bookmark view: {e}")
             return None
 
     @staticmethod
     def canonical_entry_id_from_entry(entry: Dict[str, Any]) -> str:
-        """Return the canonical entry_id used by the poster/db."""
+        """Return the canonical entry_id used by the poster/db (the entry dict is left untouched)."""
         if not entry:
             return ""
-        if entry.get('entry_id'):
-            return str(entry.get('entry_id'))
-        if entry.get('id') is not None:
-            return f"miniflux:{entry.get('id')}"
-        if entry.get('url'):
-            return f"url:{entry.get('url')}"
+        entry_id = entry.get('entry_id')
+        if entry_id:
+            return str(entry_id)
+        miniflux_id = entry.get('id')
+        if miniflux_id is not None:
+            return f"miniflux:{miniflux_id}"
+        url = entry.get('url')
+        if url:
+            return f"url:{url}"
         return ""
 
 
@@ -196,17 +492,7 @@ class EntryBookmarkButton(discord.ui.Button):
         self.manager = manager
 
     async def callback(self, interaction: Interaction):
-        user_id = interaction.user.id
-        entry_id = self.manager.canonical_entry_id_from_entry(self.entry)
-        title = self.entry.get('title') or self.entry.get('url') or 'Article'
-        try:
-            is_bm = await self.manager.is_bookmarked(user_id, entry_id)
-            pv = PersonalBookmarkView(self.entry, self.manager, user_id, is_bm)
-            msg = f"🔖 **{title}** est déjà dans vos favoris." if is_bm else f"🔖 **{title}** n'est pas dans vos favoris."
-            await interaction.response.send_message(msg, view=pv, ephemeral=True)
-        except Exception as e:
-            logger.error(f"Error in EntryBookmarkButton callback: {e}")
-            await interaction.response.send_message("❌ Erreur lors de l'opération de favoris.", ephemeral=True)
+        await self.manager._open_personal_panel(interaction, self.entry)
 
 
 class PersonalBookmarkView(discord.ui.View):
@@ -288,166 +574,181 @@ class RemoveBookmarkButton(discord.ui.Button):
             await interaction.response.send_message("❌ Erreur interne.", ephemeral=True)
 
 
-class EntryBookmarkView(discord.ui.View):
-    """Attached to any embed the bot posts itself. Clicking opens the per-user manager."""
-    def __init__(self, entry: Dict[str, Any], manager: BookmarkManager):
-        super().__init__(timeout=None)
-        self.entry = entry
-        self.manager = manager
-        self.add_item(EntryBookmarkButton(entry, manager))
-
-
 # ── Public view for channel posts ─────────────────────────────────────────────
-class PublicManageBookmarkButton(discord.ui.Button):
-    """Single public button that adapts per-user."""
+class PublicManageBookmarkButton(discord.ui.DynamicItem[discord.ui.Button], template=r"bm:manage:(?P<entry_id>.+)"):
+    """Single public button that adapts per-user.
 
-    def __init__(self, entry: Dict[str, Any], manager: BookmarkManager):
-        super().__init__(label="🔖 Favoris", style=discord.ButtonStyle.secondary)
-        self.entry = entry
-        self.manager = manager
-
-    async def callback(self, interaction: Interaction):
-        user_id = interaction.user.id
-        entry_id = self.manager.canonical_entry_id_from_entry(self.entry)
-        title = self.entry.get('title') or self.entry.get('url') or 'Article'
+    The entry_id lives in the custom_id, so the button survives restarts and the bot
+    keeps no per-post state: the entry is re-read from news_entries on click.
+    """
 
-        try:
-            is_bm = await self.manager.is_bookmarked(user_id, entry_id)
-            # Build per-user view with either Ajouter or Retirer
-            pv = PersonalBookmarkView(self.entry, self.manager, user_id, is_bm)
+    def __init__(self, entry_id: str):
+        super().__init__(
+            discord.ui.Button(
+                label="🔖 Favoris",
+                style=discord.ButtonStyle.secondary,
+                custom_id=f"{PUBLIC_BUTTON_PREFIX}{entry_id}",
+            )
+        )
+        self.entry_id = entry_id
 
-            if is_bm:
-                msg = f"🔖 **{title}** est déjà dans vos favoris."
-            else:
-                msg = f"🔖 **{title}** n'est pas encore dans vos favoris."
+    @classmethod
+    async def from_custom_id(cls, interaction: Interaction, item: discord.ui.Button, match):
+        return cls(match["entry_id"])
 
-            await interaction.response.send_message(msg, view=pv, ephemeral=True)
+    async def callback(self, interaction: Interaction):
+        manager: Optional[BookmarkManager] = interaction.client.get_cog("BookmarkManager")
+        if manager is None:
+            await interaction.response.send_message("❌ Bookmark cog non chargé.", ephemeral=True)
+            return
 
-        except Exception as e:
-            logger.error(f"Error in PublicManageBookmarkButton callback: {e}")
-            await interaction.response.send_message("❌ Erreur interne.", ephemeral=True)
+        entry = await manager.get_entry(self.entry_id) or {'entry_id': self.entry_id}
+        await manager._open_personal_panel(interaction, entry)
 
 
 class PublicBookmarkView(discord.ui.View):
     """View for public channel messages. Always shows the neutral 'Favoris' button."""
     def __init__(self, entry: Dict[str, Any], manager: BookmarkManager, timeout: Optional[float] = None):
         super().__init__(timeout=timeout)
-        self.entry = entry
-        self.manager = manager
-        self.add_item(PublicManageBookmarkButton(entry, manager))
+        entry_id = manager.canonical_entry_id_from_entry(entry)
+        if entry_id and len(PUBLIC_BUTTON_PREFIX) + len(entry_id) <= 100:
+            self.add_item(PublicManageBookmarkButton(entry_id))
+            # Clicks are routed by the registered DynamicItem: a finished view is not kept in the ViewStore
+            self.stop()
+        else:
+            # custom_id is capped at 100 chars; very long ids keep the in-memory button
+            self.add_item(EntryBookmarkButton(entry, manager))
 
 # ── Bookmarks list panel (ephemeral) ─────────────────────────────────────────
 class BookmarksListPanelView(discord.ui.View):
-    """Panel to list a user's bookmarks paginated, allow selecting one to display full news."""
-    def __init__(self, bookmarks: List[Dict[str, Any]], manager: "BookmarkManager", page_size: int = 6):
+    """Panel to list a user's bookmarks paginated, allow selecting one to display full news.
+
+    Only the current page is held in memory; other pages are fetched from the DB on navigation.
+    """
+    PAGE_SIZE = 6
+
+    def __init__(self, page_items: List[Dict[str, Any]], total: int, manager: "BookmarkManager", user_id: int,
+                 page_size: int = PAGE_SIZE):
         super().__init__(timeout=300)
-        self.bookmarks = bookmarks
+        self.page_items = page_items
+        self.total = total
+        self.user_id = user_id
         self.page_size = max(1, page_size)
         self.current_page = 0
-        self.max_page = max(0, (len(self.bookmarks) - 1) // self.page_size)
+        self.max_page = max(0, (self.total - 1) // self.page_size)
         self.manager = manager
+
+        # Components are created once; navigation only swaps the select's options
+        self.select = discord.ui.Select(placeholder="Choisir un favori...", min_values=1, max_values=1, row=0)
+        self.select.callback = self._on_select
+        self.prev_button = discord.ui.Button(label='◀ Précédent', style=discord.ButtonStyle.secondary, custom_id='prev', row=1)
+        self.prev_button.callback = self._prev
+        self.next_button = discord.ui.Button(label='Suivant ▶', style=discord.ButtonStyle.secondary, custom_id='next', row=1)
+        self.next_button.callback = self._next
+        self.close_button = discord.ui.Button(label='❌ Fermer', style=discord.ButtonStyle.danger, custom_id='close', row=1)
+        self.close_button.callback = self._close
+
         self._build_page_components()
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+        self.add_item(self.close_button)
 
     def _build_page_components(self):
-        """Rebuild select menu and nav buttons for current page"""
-        self.clear_items()
+        """Refresh the select menu options for the current page (the select is detached when the page is empty)"""
         start = self.current_page * self.page_size
-        page_items = self.bookmarks[start:start + self.page_size]
 
         options = []
-        for idx, bm in enumerate(page_items, start=start):
+        for idx, bm in enumerate(self.page_items, start=start):
             title = bm.get('title') or bm.get('url') or 'Article'
             label = f"{idx+1}. {title}"
             if len(label) > 100:
                 label = label[:97] + '...'
             options.append(discord.SelectOption(label=label, value=str(idx)))
+        self.select.options = options
+        # Discord rejects a select without options
+        if options and self.select not in self.children:
+            self.add_item(self.select)
+        elif not options and self.select in self.children:
+            self.remove_item(self.select)
+
+    async def _on_select(self, interaction: Interaction):
+        try:
+            sel = int(self.select.values[0])
+            bm = self.page_items[sel - self.current_page * self.page_size]
+            embed = discord.Embed(title=bm.get('title') or 'Article', color=0x2F3136)
+            if bm.get('summary'):
+                embed.description = bm.get('summary')
+            if bm.get('image_url'):
+                embed.set_image(url=bm.get('image_url'))
+            if bm.get('url'):
+                embed.add_field(name='🔗 Lien', value=bm.get('url'), inline=False)
+            content = await self.manager.get_bookmark_detail(self.user_id, bm['entry_id'])
+            if content:
+                if len(content) > 4000:
+                    content = content[:3997] + '...'
+                embed.add_field(name='📝 Contenu', value=content, inline=False)
+
+            # Only build the view that is actually sent
+            if interaction.guild_id and interaction.channel:
+                # Post publicly with a single "manage" button (per-user ephemeral chooser)
+                public_view = PublicBookmarkView(bm, self.manager, timeout=None)
+                await interaction.channel.send(embed=embed, view=public_view)
+                await interaction.response.send_message("✅ Article publié.", ephemeral=True)
+            else:
+                # selected from user's own list → True
+                personal_view = PersonalBookmarkView(bm, self.manager, interaction.user.id, True)
+                await interaction.response.send_message(embed=embed, view=personal_view, ephemeral=True)
+        except Exception as e:
+            logger.error(f"Error showing bookmark detail: {e}")
+            try:
+                await interaction.response.send_message("❌ Impossible d'afficher le bookmark.", ephemeral=True)
+            except Exception:
+                pass
 
-        if options:
-            select = discord.ui.Select(placeholder="Choisir un favori...", min_values=1, max_values=1, options=options)
+    async def _show_page(self, interaction: Interaction, page: int):
+        # Fetching the page is a DB round trip: acknowledge first, then edit
+        await interaction.response.defer()
+        # Bookmarks may have been removed since the panel opened: recount and clamp the page
+        self.total = await self.manager.count_user_bookmarks(self.user_id)
+        self.max_page = max(0, (self.total - 1) // self.page_size)
+        page = min(page, self.max_page)
+        self.current_page = page
+        self.page_items = await self.manager.get_user_bookmarks_page(
+            self.user_id, page * self.page_size, self.page_size
+        )
+        self._build_page_components()
+        await interaction.edit_original_response(embed=self.build_page_embed(), view=self)
 
-            async def _on_select(interaction: Interaction):
-                try:
-                    sel = int(select.values[0])
-                    bm = self.bookmarks[sel]
-                    embed = discord.Embed(title=bm.get('title') or 'Article', color=0x2F3136)
-                    if bm.get('summary'):
-                        embed.description = bm.get('summary')
-                    if bm.get('image_url'):
-                        embed.set_image(url=bm.get('image_url'))
-                    if bm.get('url'):
-                        embed.add_field(name='🔗 Lien', value=bm.get('url'), inline=False)
-                    if bm.get('content'):
-                        content = bm.get('content')
-                        if len(content) > 4000:
-                            content = content[:3997] + '...'
-                        embed.add_field(name='📝 Contenu', value=content, inline=False)
-
-                    user_id = interaction.user.id
-                    personal_view = PersonalBookmarkView(bm, self.manager, user_id, True)  # selected from user's own list → True
-
-                    if interaction.guild_id and interaction.channel:
-                        # Post publicly with a single "manage" button (per-user ephemeral chooser)
-                        public_view = PublicBookmarkView(bm, self.manager, timeout=None)
-                        await interaction.channel.send(embed=embed, view=public_view)
-                        await interaction.response.send_message("✅ Article publié.", ephemeral=True)
-                    else:
-                        await interaction.response.send_message(embed=embed, view=personal_view, ephemeral=True)
-                except Exception as e:
-                    logger.error(f"Error showing bookmark detail: {e}")
-                    try:
-                        await interaction.response.send_message("❌ Impossible d'afficher le bookmark.", ephemeral=True)
-                    except Exception:
-                        pass
-
-            select.callback = _on_select
-            self.add_item(select)
-
-        # navigation buttons
-        self.add_item(discord.ui.Button(label='◀ Précédent', style=discord.ButtonStyle.secondary, custom_id='prev'))
-        self.add_item(discord.ui.Button(label='Suivant ▶', style=discord.ButtonStyle.secondary, custom_id='next'))
-        self.add_item(discord.ui.Button(label='❌ Fermer', style=discord.ButtonStyle.danger, custom_id='close'))
-
-        # bind callbacks for nav buttons
-        for item in list(self.children):
-            if isinstance(item, discord.ui.Button) and item.custom_id == 'prev':
-                async def _prev(interaction: Interaction, button=item):
-                    if self.current_page > 0:
-                        self.current_page -= 1
-                        self._build_page_components()
-                        await interaction.response.edit_message(embed=self.build_page_embed(self.current_page), view=self)
-                item.callback = _prev
-
-            if isinstance(item, discord.ui.Button) and item.custom_id == 'next':
-                async def _next(interaction: Interaction, button=item):
-                    if self.current_page < self.max_page:
-                        self.current_page += 1
-                        self._build_page_components()
-                        await interaction.response.edit_message(embed=self.build_page_embed(self.current_page), view=self)
-                item.callback = _next
-
-            if isinstance(item, discord.ui.Button) and item.custom_id == 'close':
-                async def _close(interaction: Interaction, button=item):
-                    await interaction.response.edit_message(content='Panel fermé.', embed=None, view=None)
-                item.callback = _close
-
-    def build_page_embed(self, page: int) -> discord.Embed:
-        page = max(0, min(page, self.max_page))
+    async def _prev(self, interaction: Interaction):
+        if self.current_page > 0:
+            await self._show_page(interaction, self.current_page - 1)
+
+    async def _next(self, interaction: Interaction):
+        if self.current_page < self.max_page:
+            await self._show_page(interaction, self.current_page + 1)
+
+    async def _close(self, interaction: Interaction):
+        await interaction.response.edit_message(content='Panel fermé.', embed=None, view=None)
+
+    def build_page_embed(self) -> discord.Embed:
+        page = self.current_page
         start = page * self.page_size
-        page_items = self.bookmarks[start:start + self.page_size]
         lines = []
-        for idx, bm in enumerate(page_items, start=start):
+        for idx, bm in enumerate(self.page_items, start=start):
             title = bm.get('title') or bm.get('url') or 'Article'
             url = bm.get('url') or ''
-            added = bm.get('added_at') or ''
+            added = _format_added_at(bm.get('added_at'))
             lines.append(f"**{idx+1}.** [{title}]({url}) — ajouté: {added}")
 
-        embed = discord.Embed(title='🔖 Vos favoris', description='\n'.join(lines), color=0x2F3136)
-        embed.set_footer(text=f'Page {page+1}/{self.max_page+1} — {len(self.bookmarks)} bookmarks')
+        embed = discord.Embed(title='🔖 Vos favoris', description='\n'.join(lines) or 'Aucun favori.', color=0x2F3136)
+        embed.set_footer(text=f'Page {page+1}/{self.max_page+1} — {self.total} bookmarks')
         return embed
 
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(BookmarkManager(bot))
+    # Route clicks on public "Favoris" buttons, including messages posted before a restart
+    bot.add_dynamic_items(PublicManageBookmarkButton)
 
     # Register the /news group with favoris subcommand
     try:
@@ -1,8 +1,12 @@
 import os
 import asyncio
+import functools
+import hashlib
+import json
 import logging
+import operator
 import time
-from typing import Literal, List
+from typing import Awaitable, Callable, Dict, Literal, List, Optional
 
 import discord
 from discord import app_commands
@@ -11,37 +15,51 @@ from dotenv import load_dotenv
 
 from miniflux import run_miniflux_loop
 
+try:
+    # libuv-backed event loop (Linux/macOS); falls back to the default loop elsewhere
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Env & Logging
 # ──────────────────────────────────────────────────────────────────────────────
 load_dotenv()
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 
-_dev_guild = os.getenv("DEV_GUILD_ID")
-DEV_GUILD_ID = int(_dev_guild) if _dev_guild else None  # Optional dev server for instant sync
-DEV_GUILD_OBJECT = discord.Object(id=DEV_GUILD_ID) if DEV_GUILD_ID else None
-
 logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
 logger = logging.getLogger(__name__)
 
-# Owner config
-_owner_env = os.getenv("BOT_OWNER_ID")
-if _owner_env:
-    try:
-        OWNER_ID = int(_owner_env)
-    except ValueError:
-        logger.warning("BOT_OWNER_ID set but is not an integer; ignoring.")
-        OWNER_ID = None
-else:
-    OWNER_ID = None
+
+def _int_env(name: str) -> Optional[int]:
+    """Parse an integer env var; unset or malformed values give None."""
+    value = os.environ.get(name)
+    if value and value.lstrip("-").isdigit():
+        return int(value)
+    if value:
+        logger.warning(f"{name} set but is not an integer; ignoring.")
+    return None
+
+
+DEV_GUILD_ID = _int_env("DEV_GUILD_ID")  # Optional dev server for instant sync
+OWNER_ID = _int_env("BOT_OWNER_ID")
+
+
+@functools.cache
+def dev_guild_object() -> Optional[discord.Object]:
+    return discord.Object(id=DEV_GUILD_ID) if DEV_GUILD_ID else None
 
 # Extensions to load/reload (must be importable: wishlist.py, igdb.py, search.py, bookmarks.py)
 EXTENSIONS: List[str] = ["wishlist", "igdb", "search", "bookmarks"]
 
+# Hash of the last command tree pushed to Discord; setup_hook skips the sync when it matches
+SYNC_HASH_PATH = ".arca_sync_hash"
+FORCE_SYNC = bool(os.getenv("FORCE_SYNC"))
+
 # Helper: safe decorator for dev-only commands (no-op when DEV_GUILD_ID is not set)
 def dev_guilds_decorator():
-    if DEV_GUILD_OBJECT:
-        return app_commands.guilds(DEV_GUILD_OBJECT)
+    if DEV_GUILD_ID:
+        return app_commands.guilds(dev_guild_object())
     # identity decorator when no dev guild is configured
     def identity(f):
         return f
@@ -56,23 +74,89 @@ class ArcaBot(commands.Bot):
 
     async def setup_hook(self):
         # 1) Load extensions first so all commands are registered
-        for ext in EXTENSIONS:
-            await self.load_extension(ext)
+        results = await asyncio.gather(*(self.load_extension(ext) for ext in EXTENSIONS), return_exceptions=True)
+        failed: List[str] = []
+        for ext, result in zip(EXTENSIONS, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to load extension {ext}", exc_info=result)
+                failed.append(ext)
+
+        # Resolve ownership once so owner checks never hit the API on the interaction path
+        if OWNER_ID is not None:
+            self.owner_id = OWNER_ID
+        else:
+            try:
+                app_info = await self.application_info()
+                if app_info.team:
+                    # Team-owned app: owner is the team's placeholder user; mirror commands.Bot.is_owner
+                    self.owner_ids = {
+                        m.id
+                        for m in app_info.team.members
+                        if m.role in (discord.TeamMemberRole.admin, discord.TeamMemberRole.developer)
+                    }
+                else:
+                    self.owner_id = app_info.owner.id
+            except Exception:
+                logger.exception("Could not resolve application owner; owner-only commands are disabled")
+
+        # A partial tree would unpublish the failed cogs' commands, and its saved hash would keep
+        # the next healthy boot from restoring them: leave Discord's current commands alone
+        if failed:
+            logger.warning(f"⏭️ Skipping command sync: extension(s) failed to load: {', '.join(failed)}")
+            refresh_command_index()
+            return
+
+        # Syncing is rate-limited and slow: only push when the command tree actually changed
+        tree_hash = command_tree_hash(self.tree)
+        if not FORCE_SYNC and tree_hash == read_sync_hash():
+            logger.info("⏭️ Command tree unchanged since last sync; skipping (set FORCE_SYNC=1 to override)")
+            refresh_command_index()
+            return
 
         try:
             # 2) If a dev guild is configured, overlay globals there for instant testing
             if DEV_GUILD_ID:
-                dev = discord.Object(id=DEV_GUILD_ID)
                 # Copy current global commands to dev guild and sync
-                self.tree.copy_global_to(guild=dev)
-                dev_synced = await self.tree.sync(guild=dev)
+                self.tree.copy_global_to(guild=dev_guild_object())
+                dev_synced = await self.tree.sync(guild=dev_guild_object())
                 logger.info(f"✅ Dev overlay: {len(dev_synced)} command(s) in guild {DEV_GUILD_ID}")
 
             # 3) Publish/refresh global commands (last)
             global_synced = await self.tree.sync()
             logger.info(f"✅ Global sync: {len(global_synced)} command(s) published")
+            write_sync_hash(tree_hash)
         except Exception:
             logger.exception("setup_hook sync failed")
+        refresh_command_index()
+
+
+def command_tree_hash(tree: app_commands.CommandTree) -> str:
+    """Stable digest of the global (and dev guild) command payloads.
+
+    Commands are sorted by name: registration order depends on which extension finishes loading first.
+    """
+    by_name = operator.attrgetter("qualified_name")
+    payload = [c.to_dict(tree) for c in sorted(tree.get_commands(), key=by_name)]
+    if DEV_GUILD_ID:
+        payload.append(DEV_GUILD_ID)
+        payload.extend(c.to_dict(tree) for c in sorted(tree.get_commands(guild=dev_guild_object()), key=by_name))
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def read_sync_hash() -> str:
+    try:
+        with open(SYNC_HASH_PATH, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def write_sync_hash(value: str) -> None:
+    try:
+        with open(SYNC_HASH_PATH, "w", encoding="utf-8") as f:
+            f.write(value)
+    except OSError:
+        logger.warning(f"Could not persist sync hash to {SYNC_HASH_PATH}")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Instantiate bot
@@ -81,14 +165,119 @@ intents = discord.Intents.default()
 bot = ArcaBot(command_prefix="!", intents=intents)
 START_TIME = time.time()
 
+# ──────────────────────────────────────────────────────────────────────────────
+# Help texts & command listing cache
+# ──────────────────────────────────────────────────────────────────────────────
+AIDE_USAGE = (
+    "Vous pouvez utiliser le bot dans un serveur ou en message privé (DM).\n"
+    "Utilisez les commandes slash (préfixe /)."
+)
+
+AIDE_WISHLIST_HELP = (
+    "• `/wishlist show [@membre]` — Affiche votre wishlist; si vous passez un membre, affiche la sienne si elle est publique\n"
+    "• `/wishlist visibility <public: bool>` — Définir la visibilité de votre wishlist (True = publique, False = privée)\n"
+    "• `/wishlist clear` — Vide votre wishlist\n"
+    "• `/wishlist calendar <mois> <annee>` — Affiche les sorties du mois pour votre wishlist\n"
+    "\n"
+    "• `/sorties [platform_id]` — Affiche les prochaines sorties (optionnel: filtre par platform_id)\n"
+    "• `/recherche <nom_du_jeu> [platform_id]` — Rechercher un jeu par nom (optionnel: platform_id)"
+)
+
+AIDE_BOOKMARKS_HELP = (
+    "• `/news favoris` — Affiche vos favoris (news)\n"
+    "• Pour ajouter un favori : cliquez sur le bouton \"🔖 Favori\" sous une news publiée.\n"
+    "• Vous pouvez consulter, parcourir et publier vos favoris depuis le panneau interactif."
+)
+
+# Static part of the /aide embed; each call copies it and appends the dynamic fields
+_AIDE_EMBED_TEMPLATE = discord.Embed(title="Aide — ArcaNews", color=0x2F3136, description=AIDE_USAGE)
+_AIDE_EMBED_TEMPLATE.add_field(name="Commandes principales (wishlist)", value=AIDE_WISHLIST_HELP, inline=False)
+_AIDE_EMBED_TEMPLATE.add_field(name="Favoris (news)", value=AIDE_BOOKMARKS_HELP, inline=False)
+
+# Discord limits: 2000 chars per message (minus code fences), 1024 per embed field, 6000 per embed
+DEBUG_LIST_MAX_CHARS = 1900
+EMBED_FIELD_MAX_CHARS = 1024
+AIDE_DETAIL_MAX_CHARS = 4000  # leaves room for the static help fields in the same embed
+TRUNCATED_MARKER = "...(truncated)"
+
+# Command metadata only changes on sync: listings are rebuilt when this version moves
+_CMD_TREE_VERSION = 0
+_AIDE_CACHE = {"detail_text": None, "cmd_list_text": None, "version": -1}
+
+
+def refresh_command_index() -> None:
+    """Walk the tree once and store (qualified_name, description, scope_label) tuples on the bot."""
+    global _CMD_TREE_VERSION
+    index = []
+    for cmd in bot.tree.walk_commands():
+        guild_ids = getattr(cmd, "_guild_ids", None)
+        scope = "GLOBAL" if not guild_ids else f"GUILDS: {list(guild_ids)}"
+        index.append((cmd.qualified_name, getattr(cmd, "description", ""), scope))
+    bot._cmd_index = index
+    _CMD_TREE_VERSION += 1
+
+
+def _truncate_lines(lines: List[str], limit: int) -> str:
+    """Join lines, stopping before the text would exceed limit characters."""
+    buf: List[str] = []
+    size = 0
+    for line in lines:
+        size += len(line) + 1
+        if size > limit:
+            buf.append(TRUNCATED_MARKER)
+            break
+        buf.append(line)
+    return "\n".join(buf)
+
+
+def _chunk_lines(lines: List[str], field_limit: int, total_limit: int) -> List[str]:
+    """Split lines into embed field values of at most field_limit chars, on line boundaries."""
+    chunks: List[str] = []
+    current = ""
+    total = 0
+    for line in lines:
+        line = line[:field_limit]
+        if total + len(line) + 1 > total_limit:
+            if len(current) + 1 + len(TRUNCATED_MARKER) <= field_limit:
+                current = f"{current}\n{TRUNCATED_MARKER}"
+            break
+        total += len(line) + 1
+        if current and len(current) + 1 + len(line) > field_limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def get_command_listings():
+    """Return (debug listing, /aide detail field values), rendered at most once per index version."""
+    if _AIDE_CACHE["version"] != _CMD_TREE_VERSION:
+        index = getattr(bot, "_cmd_index", None)
+        if index is None:
+            refresh_command_index()
+            index = bot._cmd_index
+        _AIDE_CACHE["cmd_list_text"] = _truncate_lines(
+            [f"/{n} — {s} — {d or '(no description)'}" for n, d, s in index], DEBUG_LIST_MAX_CHARS
+        ) or "(none)"
+        _AIDE_CACHE["detail_text"] = _chunk_lines(
+            [f"/{n} — {d or '(pas de description)'} [{'GLOBAL' if s == 'GLOBAL' else 'DEV'}]" for n, d, s in index],
+            EMBED_FIELD_MAX_CHARS,
+            AIDE_DETAIL_MAX_CHARS,
+        ) or ["(Aucune commande enregistrée)"]
+        _AIDE_CACHE["version"] = _CMD_TREE_VERSION
+    return _AIDE_CACHE["cmd_list_text"], _AIDE_CACHE["detail_text"]
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Owner check
 # ──────────────────────────────────────────────────────────────────────────────
 def is_owner():
+    # bot.owner_id / bot.owner_ids (team-owned apps) are resolved once in setup_hook
     async def predicate(interaction: discord.Interaction) -> bool:
-        if OWNER_ID is not None:
-            return getattr(interaction.user, "id", None) == OWNER_ID
-        return await bot.is_owner(interaction.user)
+        user_id = interaction.user.id
+        return user_id == bot.owner_id or user_id in (bot.owner_ids or ())
     return app_commands.check(predicate)
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -97,45 +286,78 @@ def is_owner():
 @bot.event
 async def on_ready():
     logger.info(f"🤖 Logged in as {bot.user}")
-    logger.info("📡 Lancement de la boucle Miniflux…")
-    asyncio.create_task(run_miniflux_loop(bot))
+    # on_ready fires again after every reconnect: keep a single Miniflux loop per process
+    task = getattr(bot, "_miniflux_task", None)
+    if task is None or task.done():
+        logger.info("📡 Lancement de la boucle Miniflux…")
+        bot._miniflux_task = asyncio.create_task(run_miniflux_loop(bot), name="miniflux")
+        bot._miniflux_task.add_done_callback(_log_task_exit)
+
+
+def _log_task_exit(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logger.error(f"Task {task.get_name()} crashed", exc_info=exc)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # /sync (dev guild only; safe, no destructive clear)
 # ──────────────────────────────────────────────────────────────────────────────
+DEV_GUILD_ONLY_MESSAGE = "\u274c Cette commande est r\u00e9serv\u00e9e au serveur de d\u00e9veloppement."
+
+
+def dev_guild_only(func):
+    """Defer the interaction, then reject invocations outside the dev guild (when one is configured)."""
+    @functools.wraps(func)
+    async def wrapper(interaction: discord.Interaction, *args, **kwargs):
+        # Acknowledge first: everything below may take longer than the 3 s interaction window
+        await interaction.response.defer(ephemeral=True)
+        if DEV_GUILD_ID and interaction.guild_id != DEV_GUILD_ID:
+            await interaction.followup.send(DEV_GUILD_ONLY_MESSAGE, ephemeral=True)
+            return
+        return await func(interaction, *args, **kwargs)
+    return wrapper
+
+
+async def _sync_dev(interaction: discord.Interaction) -> str:
+    if not DEV_GUILD_ID:
+        return "No DEV_GUILD_ID set."
+    # mirror current globals into dev and sync
+    bot.tree.copy_global_to(guild=dev_guild_object())
+    synced = await bot.tree.sync(guild=dev_guild_object())
+    refresh_command_index()
+    return f"✅ Synced {len(synced)} command(s) to dev guild."
+
+
+async def _sync_global(interaction: discord.Interaction) -> str:
+    synced = await bot.tree.sync()
+    refresh_command_index()
+    return f"✅ Synced {len(synced)} global command(s)."
+
+
+# Destructive clears live in admin_commands.manage_commands; /sync only publishes
+_SYNC_HANDLERS: Dict[str, Callable[[discord.Interaction], Awaitable[str]]] = {
+    "dev": _sync_dev,
+    "global": _sync_global,
+}
+
+
 @bot.tree.command(name="sync", description="Owner: sync commands")
 @dev_guilds_decorator()
 @is_owner()
 @app_commands.describe(scope="dev | global")
+@dev_guild_only
 async def sync_cmd(
     interaction: discord.Interaction,
     scope: Literal["dev", "global"] = "dev",
 ):
-    # If a dev guild is configured, reject invocations outside it
-    if DEV_GUILD_ID and interaction.guild_id != DEV_GUILD_ID:
-        await interaction.response.send_message(
-            "\u274c Cette commande est r\u00e9serv\u00e9e au serveur de d\u00e9veloppement.", ephemeral=True
-        )
-        return
-
-    await interaction.response.defer(ephemeral=True)
     try:
-        if scope == "dev":
-            if not DEV_GUILD_ID:
-                return await interaction.followup.send("No DEV_GUILD_ID set.", ephemeral=True)
-            dev = discord.Object(id=DEV_GUILD_ID)
-            # mirror current globals into dev and sync
-            bot.tree.copy_global_to(guild=dev)
-            synced = await bot.tree.sync(guild=dev)
-            return await interaction.followup.send(f"✅ Synced {len(synced)} command(s) to dev guild.", ephemeral=True)
-
-        if scope == "global":
-            synced = await bot.tree.sync()
-            return await interaction.followup.send(f"✅ Synced {len(synced)} global command(s).", ephemeral=True)
-
+        msg = await _SYNC_HANDLERS[scope](interaction)
     except Exception as e:
         logger.exception("Sync failed")
-        await interaction.followup.send(f"Sync failed: {e}", ephemeral=True)
+        msg = f"Sync failed: {e}"
+    await interaction.followup.send(msg, ephemeral=True)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # /debug_commands (dev guild only)
@@ -143,63 +365,34 @@ async def sync_cmd(
 @bot.tree.command(name="debug_commands", description="Owner: list registered app commands")
 @dev_guilds_decorator()
 @is_owner()
+@dev_guild_only
 async def debug_commands(interaction: discord.Interaction):
-    if DEV_GUILD_ID and interaction.guild_id != DEV_GUILD_ID:
-        await interaction.response.send_message(
-            "\u274c Cette commande est r\u00e9serv\u00e9e au serveur de d\u00e9veloppement.", ephemeral=True
-        )
-        return
-
-    lines = []
     try:
-        for cmd in bot.tree.walk_commands():
-            guild_ids = getattr(cmd, "_guild_ids", None)
-            scope = "GLOBAL" if not guild_ids else f"GUILDS: {list(guild_ids)}"
-            desc = getattr(cmd, "description", "") or "(no description)"
-            lines.append(f"/{cmd.qualified_name} — {scope} — {desc}")
-        text = "\n".join(lines) or "(none)"
+        text, _ = get_command_listings()
     except Exception as e:
         text = f"(error collecting commands: {e})"
 
     # send as code block to avoid embed limits
-    await interaction.response.send_message(f"```{text}```", ephemeral=True)
+    await interaction.followup.send(f"```{text}```", ephemeral=True)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Aide / Help (global)
 # ──────────────────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _fmt_uptime(minute_bucket: int) -> str:
+    """Uptime shown in /aide, at minute resolution so bursts reuse the same string."""
+    h, m = divmod(minute_bucket, 60)
+    return f"{h}h {m}m"
+
 @bot.tree.command(name="aide", description="Affiche l'aide et le statut du bot")
 @app_commands.describe(detail="Afficher la liste complète des commandes")
 async def aide_cmd(interaction: discord.Interaction, detail: bool = False):
     """Compact help embed + status. Uses slash commands only (global)."""
-    usage = (
-        "Vous pouvez utiliser le bot dans un serveur ou en message privé (DM).\n"
-        "Utilisez les commandes slash (préfixe /)."
-    )
-
-    wishlist_help = (
-        "• `/wishlist show [@membre]` — Affiche votre wishlist; si vous passez un membre, affiche la sienne si elle est publique\n"
-        "• `/wishlist visibility <public: bool>` — Définir la visibilité de votre wishlist (True = publique, False = privée)\n"
-        "• `/wishlist clear` — Vide votre wishlist\n"
-        "• `/wishlist calendar <mois> <annee>` — Affiche les sorties du mois pour votre wishlist\n"
-        "\n"
-        "• `/sorties [platform_id]` — Affiche les prochaines sorties (optionnel: filtre par platform_id)\n"
-        "• `/recherche <nom_du_jeu> [platform_id]` — Rechercher un jeu par nom (optionnel: platform_id)"
-    )
-
-    bookmarks_help = (
-        "• `/news favoris` — Affiche vos favoris (news)\n"
-        "• Pour ajouter un favori : cliquez sur le bouton \"🔖 Favori\" sous une news publiée.\n"
-        "• Vous pouvez consulter, parcourir et publier vos favoris depuis le panneau interactif."
-    )
-
-    uptime_seconds = int(time.time() - START_TIME)
-    uptime = f"{uptime_seconds // 3600}h {(uptime_seconds % 3600) // 60}m {uptime_seconds % 60}s"
+    await interaction.response.defer(ephemeral=True)
+    uptime = _fmt_uptime(int((time.time() - START_TIME) // 60))
     latency_ms = int(bot.latency * 1000) if bot.latency else None
 
-    embed = discord.Embed(title="Aide — ArcaNews", color=0x2F3136)
-    embed.description = usage
-    embed.add_field(name="Commandes principales (wishlist)", value=wishlist_help, inline=False)
-    embed.add_field(name="Favoris (news)", value=bookmarks_help, inline=False)
+    embed = _AIDE_EMBED_TEMPLATE.copy()
     status_value = f"Latency: {latency_ms} ms\nUptime: {uptime}"
     if OWNER_ID:
         status_value += f"\nOwner: <@{OWNER_ID}>"
@@ -207,21 +400,14 @@ async def aide_cmd(interaction: discord.Interaction, detail: bool = False):
 
     if detail:
         try:
-            cmds = []
-            for cmd in bot.tree.walk_commands():
-                name = f"/{cmd.qualified_name}"
-                desc = getattr(cmd, "description", "") or "(pas de description)"
-                scope = "GLOBAL" if not getattr(cmd, "_guild_ids", None) else "DEV"
-                cmds.append(f"{name} — {desc} [{scope}]")
-            embed.add_field(
-                name="Liste complète des commandes",
-                value="\n".join(cmds) if cmds else "(Aucune commande enregistrée)",
-                inline=False
-            )
+            _, detail_chunks = get_command_listings()
+            for i, chunk in enumerate(detail_chunks):
+                name = "Liste complète des commandes" if i == 0 else "Liste complète (suite)"
+                embed.add_field(name=name, value=chunk, inline=False)
         except Exception:
             embed.add_field(name="Liste complète des commandes", value="(Impossible de lister les commandes)", inline=False)
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+    await interaction.followup.send(embed=embed, ephemeral=True)
 
 # ──────────────────────────────────────────────────────────────────────────────
 # Entrypoint
@@ -232,4 +418,6 @@ async def main():
     await bot.start(DISCORD_TOKEN)
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -1,14 +1,29 @@
 import os
+import asyncio
 import aiohttp
 import datetime
+import functools
 import logging
+import random
+import time
+from collections import OrderedDict
+from operator import itemgetter
 import discord
 from discord import app_commands, Embed, Interaction
 from discord.ext import commands
 from discord.ui import View, Button
 from dotenv import load_dotenv
-from typing import List, Optional, Dict, Any
-from ui_components import UpcomingReleasesView, GameEmbedView
+from typing import Awaitable, Callable, Hashable, List, Optional, Dict, Any
+from ui_components import UpcomingReleasesView, GameEmbedView, LazyEmbedList
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_dumps = lambda obj: json.dumps(obj).encode()
 
 load_dotenv()
 CLIENT_ID = os.getenv("IGDB_CLIENT_ID")
@@ -22,6 +37,13 @@ IGDB_GAMES_URL = "https://api.igdb.com/v4/games"
 DAYS_AHEAD = 60
 EMBED_COLOR = 0x5865F2
 PAGINATION_TIMEOUT = 300  # 5 minutes
+RESPONSE_CACHE_TTL = 900  # 15 minutes; release dates don't move on that scale
+RESPONSE_CACHE_MAX = 32
+RESPONSE_CACHE_DIR = "data/cache"  # survives restarts; one igdb_<platform>.json per platform
+MAX_RETRIES = 8
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RATE_LIMIT_PER_SEC = 4.0
+AUTOCOMPLETE_LIMIT = 25  # Discord limit
 
 PLATFORMS = [
     {"id": 6, "name": "PC (Windows)"},
@@ -33,6 +55,70 @@ PLATFORMS = [
     {"id": 508, "name": "Nintendo Switch 2"},
 ]
 
+IGDB_COVER_URL = "https://images.igdb.com/igdb/image/upload/t_cover_big/{image_id}.jpg"
+# release_dates.platform comes back as a bare id; known ids map to their PLATFORMS entry
+_PLATFORM_REFS = {p["id"]: p for p in PLATFORMS}
+_PLATFORM_BY_ID = {p["id"]: p["name"] for p in PLATFORMS}
+# Lowercased once for the per-keystroke autocomplete
+_PLATFORM_CHOICES = [(p["name"].lower(), app_commands.Choice(name=p["name"], value=p["id"])) for p in PLATFORMS]
+# Shown before anything is typed
+_DEFAULT_PLATFORM_CHOICES = tuple(choice for _, choice in _PLATFORM_CHOICES[:AUTOCOMPLETE_LIMIT])
+
+_FR_MONTHS = (
+    "janvier", "février", "mars", "avril", "mai", "juin",
+    "juillet", "août", "septembre", "octobre", "novembre", "décembre"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_date_cached(timestamp: int) -> str:
+    """French 'day month year' rendering of a unix timestamp; pagination re-renders hit the cache"""
+    try:
+        date_obj = datetime.date.fromtimestamp(timestamp)
+        return f"{date_obj.day} {_FR_MONTHS[date_obj.month - 1]} {date_obj.year}"
+    except (ValueError, IndexError, OSError, OverflowError):
+        return "Date invalide"
+
+@functools.lru_cache(maxsize=2048)
+def _cover_url(image_id: str) -> str:
+    """Full-size HTTPS cover URL for an IGDB image_id"""
+    return IGDB_COVER_URL.format(image_id=image_id)
+
+
+@functools.lru_cache(maxsize=256)
+def platform_choices(current_lower: str) -> tuple:
+    """Platform choices whose name contains current_lower; mid-typing prefixes repeat a lot"""
+    if not current_lower:
+        return _DEFAULT_PLATFORM_CHOICES
+    out = []
+    for lower, choice in _PLATFORM_CHOICES:
+        if current_lower in lower:
+            out.append(choice)
+            if len(out) == AUTOCOMPLETE_LIMIT:
+                break
+    return tuple(out)
+
+
+async def single_flight(inflight: Dict[Hashable, asyncio.Task], key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Await factory() once per key: concurrent callers share a single task.
+
+    The work runs in its own task and each caller awaits it through asyncio.shield, so a
+    cancelled caller (e.g. an expired interaction) never cancels or fails the others.
+    """
+    task = inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        inflight[key] = task
+
+        def _done(t: asyncio.Task) -> None:
+            if inflight.get(key) is t:
+                del inflight[key]
+            if not t.cancelled():
+                t.exception()  # mark retrieved in case every caller was cancelled
+
+        task.add_done_callback(_done)
+    return await asyncio.shield(task)
+
 class IGDBError(Exception):
     """Custom exception for IGDB API errors"""
     pass
@@ -41,30 +127,49 @@ class IGDB(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.token: Optional[str] = None
-        self.token_expires_at: Optional[datetime.datetime] = None
+        self.token_expires_at: Optional[float] = None  # unix timestamp
         self.session: Optional[aiohttp.ClientSession] = None
-        self.wishlist_manager: Optional[Any] = None
+        # platform_id -> (expires_at, games); expiry is checked on read
+        self._response_cache: "OrderedDict[Optional[int], tuple]" = OrderedDict()
+        self._cache_lock = asyncio.Lock()
+        self._token_task: Optional[asyncio.Task] = None
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        # Client-side token bucket matching IGDB's 4 requests/second limit
+        self._rate_tokens = RATE_LIMIT_PER_SEC
+        self._rate_last = time.monotonic()
+        self._rate_lock = asyncio.Lock()
 
     async def cog_load(self):
         """Initialize the cog with a persistent session"""
-        self.session = aiohttp.ClientSession()
-        # Get wishlist manager reference
-        self.wishlist_manager = self.bot.get_cog('WishlistManager')
+        # Keep-alive pool with DNS caching: api.igdb.com / id.twitch.tv are hit repeatedly
+        connector = aiohttp.TCPConnector(limit=50, limit_per_host=20, ttl_dns_cache=300, keepalive_timeout=75)
+        timeout = aiohttp.ClientTimeout(total=15, connect=5)
+        # IGDB JSON compresses well; aiohttp decodes the gzip body transparently
+        self.session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={"Accept-Encoding": "gzip"}
+        )
+        await asyncio.to_thread(self._load_disk_cache)
+        # Keep the OAuth token fresh off the request path
+        if CLIENT_ID and CLIENT_SECRET:
+            self._token_task = asyncio.create_task(self._token_refresh_loop())
         logger.info("🎮 IGDB Cog loaded")
 
+    @property
+    def wishlist_manager(self) -> Optional[Any]:
+        """Resolved per use: extensions load concurrently, so it may not exist yet at cog_load"""
+        return self.bot.get_cog('WishlistManager')
+
     async def cog_unload(self):
         """Clean up resources when unloading"""
+        if self._token_task:
+            self._token_task.cancel()
         if self.session and not self.session.closed:
             await self.session.close()
         logger.info("🎮 IGDB Cog unloaded")
 
     def _is_token_valid(self) -> bool:
         """Check if the current token is still valid"""
-        return (
-            self.token is not None and 
-            self.token_expires_at is not None and 
-            datetime.datetime.now() < self.token_expires_at
-        )
+        return self.token is not None and self.token_expires_at is not None and time.time() < self.token_expires_at
 
     async def _get_token(self) -> None:
         """Fetch a new OAuth token from Twitch"""
@@ -91,18 +196,79 @@ class IGDB(commands.Cog):
                 expires_in = data.get("expires_in", 3600)  # Default 1 hour
                 
                 # Set expiration 5 minutes before actual expiration for safety
-                self.token_expires_at = datetime.datetime.now() + datetime.timedelta(
-                    seconds=expires_in - 300
-                )
+                self.token_expires_at = time.time() + expires_in - 300
                 
                 logger.info("🎟️ IGDB token refreshed")
                 
         except aiohttp.ClientError as e:
             raise IGDBError(f"Network error getting token: {e}")
 
+    def _load_disk_cache(self) -> None:
+        """Seed the response cache with entries written less than RESPONSE_CACHE_TTL ago"""
+        try:
+            names = os.listdir(RESPONSE_CACHE_DIR)
+        except OSError:
+            return
+        now = time.time()
+        for name in names:
+            if not (name.startswith("igdb_") and name.endswith(".json")):
+                continue
+            path = os.path.join(RESPONSE_CACHE_DIR, name)
+            try:
+                if now - os.path.getmtime(path) > RESPONSE_CACHE_TTL:
+                    continue
+                with open(path, "rb") as f:
+                    cached = _json_loads(f.read())
+                platform_id, expires_at, games = cached["platform_id"], float(cached["expires_at"]), cached["games"]
+            except Exception:
+                logger.debug(f"Ignoring unreadable IGDB cache file {path}", exc_info=True)
+                continue
+            if expires_at > now and isinstance(games, list):
+                self._response_cache[platform_id] = (expires_at, games)
+
+    def _write_disk_cache(self, platform_id: Optional[int], expires_at: float, games: List[Dict[str, Any]]) -> None:
+        """Persist one response atomically (tempfile + os.replace)"""
+        path = os.path.join(RESPONSE_CACHE_DIR, f"igdb_{platform_id or 'all'}.json")
+        tmp = f"{path}.tmp"
+        try:
+            os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(_json_dumps({"platform_id": platform_id, "expires_at": expires_at, "games": games}))
+            os.replace(tmp, path)
+        except Exception:
+            logger.debug(f"Could not write IGDB cache file {path}", exc_info=True)
+
+    async def _token_refresh_loop(self) -> None:
+        """Refresh the token shortly before it expires so user commands never wait on Twitch"""
+        while True:
+            try:
+                if not self._is_token_valid():
+                    await self._get_token()
+                # token_expires_at already sits 5 minutes before the real expiry
+                sleep_for = max(60, self.token_expires_at - time.time())
+            except Exception as e:
+                logger.warning(f"Background IGDB token refresh failed: {e}")
+                sleep_for = 60
+            await asyncio.sleep(sleep_for)
+
+    async def _acquire_rate_token(self) -> None:
+        """Wait until the token bucket allows another IGDB request"""
+        async with self._rate_lock:
+            now = time.monotonic()
+            self._rate_tokens = min(
+                RATE_LIMIT_PER_SEC, self._rate_tokens + (now - self._rate_last) * RATE_LIMIT_PER_SEC
+            )
+            self._rate_last = now
+            if self._rate_tokens < 1:
+                await asyncio.sleep((1 - self._rate_tokens) / RATE_LIMIT_PER_SEC)
+                self._rate_last = time.monotonic()
+                self._rate_tokens = 0
+            else:
+                self._rate_tokens -= 1
+
     def _build_query(self, platform_id: Optional[int]) -> str:
         """Build the IGDB query string"""
-        now = int(datetime.datetime.now().timestamp())
+        now = int(time.time())
         max_timestamp = now + (60 * 60 * 24 * DAYS_AHEAD)
 
         where_conditions = [
@@ -116,14 +282,23 @@ class IGDB(commands.Cog):
         where_clause = " & ".join(where_conditions)
         
         return (
-            f"fields id, name, slug, cover.url, release_dates.date, release_dates.platform.name, release_dates.platform.id;"
+            f"fields id, name, slug, cover.image_id, first_release_date, release_dates.date, "
+            f"release_dates.platform.id, release_dates.platform.name;"
             f"where {where_clause};"
             f"sort release_dates.date asc;"
             f"limit 50;"
         )
 
-    async def _fetch_games_from_api(self, query: str) -> List[Dict[str, Any]]:
-        """Make the actual API request to IGDB"""
+    async def _fetch_games_from_api(self, query: str, platform_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Make the actual API request to IGDB.
+
+        The token is normally kept fresh by _token_refresh_loop; the _get_token call here is a
+        fallback for the first request after startup or a failed background refresh.
+
+        When platform_id is given, release_dates are pruned to that platform's releases in the
+        DAYS_AHEAD window (IGDB returns every release of a matching game) and games left without
+        one are dropped.
+        """
         await self._get_token()
         
         headers = {
@@ -132,80 +307,108 @@ class IGDB(commands.Cog):
         }
 
         try:
-            async with self.session.post(IGDB_GAMES_URL, headers=headers, data=query) as resp:
-                if resp.status != 200:
-                    error_text = await resp.text()
-                    logger.error(f"IGDB API error {resp.status}: {error_text}")
-                    raise IGDBError(f"API request failed: {resp.status}")
-                
-                data = await resp.json()
+            for attempt in range(MAX_RETRIES):
+                await self._acquire_rate_token()
+                async with self.session.post(IGDB_GAMES_URL, headers=headers, data=query) as resp:
+                    if resp.status in RETRYABLE_STATUSES and attempt < MAX_RETRIES - 1:
+                        # Rate limited or transient server error: back off with jitter and retry
+                        retry_after = resp.headers.get("Retry-After")
+                        try:
+                            delay = min(30.0, float(retry_after))
+                        except (TypeError, ValueError):
+                            delay = min(30, (2 ** attempt) * 0.5) + random.uniform(0, 0.5)
+                        logger.warning(f"IGDB returned {resp.status}; retrying in {delay:.1f}s (attempt {attempt + 1})")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    if resp.status != 200:
+                        error_text = await resp.text()
+                        logger.error(f"IGDB API error {resp.status}: {error_text}")
+                        raise IGDBError(f"API request failed: {resp.status}")
+
+                    data = _json_loads(await resp.read())
+                    break
 
-                # Normalize returned game objects so callers can reliably use
-                # top-level keys like `first_release_date` and `cover_url`.
-                try:
-                    for g in data:
-                        # cover_url: prefer top-level cover_url, fall back to nested cover.url
-                        cover = g.get("cover") or {}
-                        if isinstance(cover, dict):
-                            g.setdefault("cover_url", cover.get("url"))
-
-                        # first_release_date: prefer explicit field, otherwise derive
-                        # from release_dates (use earliest date)
-                        if not g.get("first_release_date"):
-                            rds = g.get("release_dates") or []
-                            dates = [rd.get("date") for rd in rds if rd and rd.get("date")]
-                            if dates:
-                                try:
-                                    g["first_release_date"] = min(dates)
-                                except Exception:
-                                    pass
-                except Exception:
-                    # Normalization should not fail the whole request; log at debug level
-                    logger.debug("Failed to normalize IGDB response", exc_info=True)
-
-                return data
-                
         except aiohttp.ClientError as e:
             raise IGDBError(f"Network error: {e}")
 
-    def _filter_games_by_platform(self, games: List[Dict[str, Any]], platform_id: int) -> List[Dict[str, Any]]:
-        """Filter games to only show releases for the specified platform"""
-        now = int(datetime.datetime.now().timestamp())
-        max_timestamp = now + (60 * 60 * 24 * DAYS_AHEAD)
-        
-        filtered_games = []
-        
-        for game in games:
-            # Filter release_dates to only include the specified platform within our time window
-            filtered_releases = []
-            
-            for rd in game.get("release_dates", []):
-                platform_matches = (
-                    rd.get("platform", {}).get("id") == platform_id or 
-                    rd.get("platform") == platform_id
-                )
-                date_in_range = (
-                    now <= rd.get("date", 0) < max_timestamp
-                )
-                
-                if platform_matches and date_in_range:
-                    filtered_releases.append(rd)
-            
-            if filtered_releases:
-                game["release_dates"] = filtered_releases
-                filtered_games.append(game)
-        
-        return filtered_games
+        now = int(time.time())
+        max_ts = now + (60 * 60 * 24 * DAYS_AHEAD)
+        games: List[Dict[str, Any]] = []
+
+        # Normalize returned game objects so callers can reliably use
+        # top-level keys like `first_release_date` and `cover_url`.
+        # Platform pruning happens here too, so a game that fails is skipped, never passed through raw
+        for g in data:
+            try:
+                # cover_url: built from cover.image_id (also mirrored as cover.url for older readers);
+                # queries that still request cover.url (search.py) keep their nested URL
+                cover = g.get("cover") or {}
+                if isinstance(cover, dict):
+                    if cover.get("image_id"):
+                        cover["url"] = _cover_url(cover["image_id"])
+                    g.setdefault("cover_url", cover.get("url"))
+
+                # release_dates.platform arrives as {"id", "name"}; a bare id (older cached payloads) gets its own
+                # dict so per-game data never aliases the shared PLATFORMS entries. Pruning runs in the same pass
+                kept = []
+                for rd in g.get("release_dates") or ():
+                    pid = rd.get("platform")
+                    if isinstance(pid, dict):
+                        pid = pid.get("id")
+                    elif isinstance(pid, int):
+                        rd["platform"] = dict(_PLATFORM_REFS.get(pid) or {"id": pid})
+                    if platform_id:
+                        if pid != platform_id or not now <= rd.get("date", 0) < max_ts:
+                            continue
+                    kept.append(rd)
+                if platform_id:
+                    if not kept:
+                        continue
+                    g["release_dates"] = kept
+
+                # Earliest (kept) release, computed once here instead of sorting on every embed build
+                dated = [rd for rd in kept if rd.get("date")]
+                if dated:
+                    g["_earliest_release"] = min(dated, key=itemgetter("date"))
+
+                # first_release_date: prefer explicit field, otherwise derive
+                # from release_dates (use earliest date)
+                if not g.get("first_release_date") and dated:
+                    g["first_release_date"] = g["_earliest_release"]["date"]
+            except Exception:
+                logger.warning(f"Skipping IGDB game that failed to normalize: {g!r:.200}", exc_info=True)
+                continue
+            games.append(g)
+
+        return games
 
     async def fetch_upcoming_games(self, platform_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Fetch upcoming games, optionally filtered by platform"""
+        async with self._cache_lock:
+            cached = self._response_cache.get(platform_id)
+            if cached:
+                if cached[0] > time.time():
+                    self._response_cache.move_to_end(platform_id)
+                    return cached[1]
+                del self._response_cache[platform_id]
+
+        # Single-flight: concurrent callers for the same platform share one request
+        return await single_flight(self._inflight, (platform_id,), lambda: self._do_fetch(platform_id))
+
+    async def _do_fetch(self, platform_id: Optional[int]) -> List[Dict[str, Any]]:
+        """Query IGDB and store the result in the response cache"""
         try:
             query = self._build_query(platform_id)
-            games = await self._fetch_games_from_api(query)
-            
-            # Additional filtering for platform-specific queries
-            if platform_id and games:
-                games = self._filter_games_by_platform(games, platform_id)
+            games = await self._fetch_games_from_api(query, platform_id)
+
+            expires_at = time.time() + RESPONSE_CACHE_TTL
+            async with self._cache_lock:
+                self._response_cache[platform_id] = (expires_at, games)
+                self._response_cache.move_to_end(platform_id)
+                while len(self._response_cache) > RESPONSE_CACHE_MAX:
+                    self._response_cache.popitem(last=False)
+            await asyncio.to_thread(self._write_disk_cache, platform_id, expires_at, games)
             
             return games
             
@@ -215,85 +418,65 @@ class IGDB(commands.Cog):
             logger.error(f"Unexpected error fetching games: {e}")
             raise IGDBError(f"Unexpected error: {e}")
 
+    async def fetch_upcoming_games_all_platforms(self) -> List[Dict[str, Any]]:
+        """Fetch upcoming games for every known platform concurrently, merged by game id"""
+        results = await asyncio.gather(
+            *(self.fetch_upcoming_games(p["id"]) for p in PLATFORMS), return_exceptions=True
+        )
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for platform, result in zip(PLATFORMS, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"IGDB fetch failed for {platform['name']}: {result}")
+                continue
+            for game in result:
+                merged.setdefault(game.get("id"), game)
+        return list(merged.values())
+
     def _format_date(self, timestamp: Optional[int]) -> str:
         """Format a timestamp to a readable date string"""
         if not timestamp:
             return "Date inconnue"
-        
-        try:
-            date_obj = datetime.datetime.fromtimestamp(timestamp)
-            # French month names
-            months = [
-                "janvier", "février", "mars", "avril", "mai", "juin",
-                "juillet", "août", "septembre", "octobre", "novembre", "décembre"
-            ]
-            month_name = months[date_obj.month - 1]
-            return f"{date_obj.day} {month_name} {date_obj.year}"
-        except (ValueError, IndexError, OSError):
-            return "Date invalide"
+        return _format_date_cached(int(timestamp))
 
     def _build_game_embed(self, game: Dict[str, Any]) -> Embed:
         """Build a Discord embed for a single game"""
         name = game.get("name", "Titre inconnu")
         slug = game.get("slug")
         
-        # Get the earliest release date
-        releases = sorted(
-            [r for r in game.get("release_dates", []) if r.get("date")],
-            key=lambda r: r["date"]
-        )
-        
-        if releases:
-            release_date = releases[0]["date"]
-            platform_name = releases[0].get("platform", {}).get("name", "Plateforme inconnue")
+        # Earliest release date, precomputed in _fetch_games_from_api
+        earliest = game.get("_earliest_release")
+
+        if earliest:
+            release_date = earliest["date"]
+            platform_name = earliest.get("platform", {}).get("name", "Plateforme inconnue")
         else:
             release_date = game.get("first_release_date")
             platform_name = "Plateforme inconnue"
         
-        # Build embed
-        embed = Embed(title=name, color=EMBED_COLOR)
-        embed.add_field(
-            name="📅 Date de sortie", 
-            value=self._format_date(release_date), 
-            inline=False
-        )
-        embed.add_field(
-            name="🕹️ Plateforme", 
-            value=platform_name, 
-            inline=False
-        )
-        
+        # Assemble the raw payload and hand it to Embed.from_dict in one call
+        fields = [
+            {"name": "📅 Date de sortie", "value": self._format_date(release_date), "inline": False},
+            {"name": "🕹️ Plateforme", "value": platform_name, "inline": False},
+        ]
         # Add IGDB link if available
         if slug:
-            igdb_url = f"https://www.igdb.com/games/{slug}"
-            embed.add_field(
-                name="🔗 Lien IGDB", 
-                value=f"[Voir sur IGDB]({igdb_url})", 
-                inline=False
-            )
-        
+            fields.append({"name": "🔗 Lien IGDB", "value": f"[Voir sur IGDB](https://www.igdb.com/games/{slug})", "inline": False})
+
+        payload = {"title": name, "color": EMBED_COLOR, "fields": fields}
         # Add cover image if available
-        cover_url = game.get("cover", {}).get("url")
+        cover_url = game.get("cover_url")
         if cover_url:
-            # Ensure HTTPS and higher resolution
-            if cover_url.startswith("//"):
-                cover_url = f"https:{cover_url}"
-            # Replace thumb with cover_big for better quality
-            cover_url = cover_url.replace("t_thumb", "t_cover_big")
-            embed.set_image(url=cover_url)
-        
-        return embed
+            payload["image"] = {"url": cover_url}
 
-    def build_embeds(self, games: List[Dict[str, Any]]) -> List[Embed]:
-        """Build Discord embeds for a list of games"""
-        return [self._build_game_embed(game) for game in games]
+        return Embed.from_dict(payload)
+
+    def build_embeds(self, games: List[Dict[str, Any]]) -> LazyEmbedList:
+        """Discord embeds for a list of games, each built when its page is first shown"""
+        return LazyEmbedList(games, self._build_game_embed)
 
     def _get_platform_name(self, platform_id: int) -> str:
         """Get platform name by ID"""
-        return next(
-            (p["name"] for p in PLATFORMS if p["id"] == platform_id), 
-            "plateforme inconnue"
-        )
+        return _PLATFORM_BY_ID.get(platform_id, "plateforme inconnue")
 
     @app_commands.command(name="sorties", description="🎮 Affiche les prochaines sorties de jeux vidéo")
     @app_commands.describe(platform_id="Filtrer par plateforme (optionnel)")
@@ -336,12 +519,7 @@ class IGDB(commands.Cog):
     @sorties.autocomplete("platform_id")
     async def platform_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice]:
         """Provide autocomplete for platform selection"""
-        current_lower = current.lower()
-        return [
-            app_commands.Choice(name=platform["name"], value=platform["id"])
-            for platform in PLATFORMS 
-            if current_lower in platform["name"].lower()
-        ][:25]  # Discord limit
+        return list(platform_choices(current.lower()))
 
 
 async def setup(bot: commands.Bot):
@@ -1,21 +1,57 @@
 import os
 import aiohttp
+import aiosqlite
 import asyncio
 import logging
 import datetime
+import random
+import threading
+import time
 from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 from contextlib import asynccontextmanager
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from discord import Embed, Color
-from PIL import Image, UnidentifiedImageError
+from PIL import Image, ImageChops, ImageFile, UnidentifiedImageError
 from io import BytesIO
-from collections import Counter
+from collections import OrderedDict
 import re
 
 load_dotenv()
 
+# lxml's C tokenizer (already pulled in by readability-lxml) is much faster than the pure-Python parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# ImageFile.LOAD_TRUNCATED_IMAGES is process-wide; only flip it while holding this lock
+_TRUNCATED_DECODE_LOCK = threading.Lock()
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+_WS_RE = re.compile(r'\s+')
+
+
+async def _read_capped(resp: aiohttp.ClientResponse, limit: int) -> bytes:
+    """Read at most limit bytes of a response body (StreamReader.read(n) may return after one chunk)"""
+    buf = bytearray()
+    while len(buf) < limit:
+        chunk = await resp.content.read(limit - len(buf))
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
 # Configuration
 @dataclass
 class Config:
@@ -26,13 +62,15 @@ class Config:
     # Timing configuration
     fetch_interval_with_entries: int = 30  # seconds
     fetch_interval_no_entries: int = 60    # seconds
+    idle_backoff_factor: float = 1.5       # growth of the idle interval per empty poll
+    max_idle_interval: int = 900           # seconds
     request_delay: int = 2                 # seconds between posts
     
     # Content configuration
     max_entries_per_batch: int = 5
     max_description_length: int = 400
     min_paragraph_length: int = 50
-    image_resize_dimensions: Tuple[int, int] = (50, 50)
+    image_resize_dimensions: Tuple[int, int] = (25, 25)  # dominant color is stable even on tiny thumbnails
     request_timeout: int = 15
 
     def __post_init__(self):
@@ -61,15 +99,15 @@ class HTTPSessionManager:
     def __init__(self):
         self._session: Optional[aiohttp.ClientSession] = None
     
-    @asynccontextmanager
-    async def get_session(self):
-        """Get or create HTTP session"""
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared session if needed"""
         if self._session is None or self._session.closed:
             connector = aiohttp.TCPConnector(
-                limit=20,  # Total connection pool size
-                limit_per_host=5,  # Max connections per host
-                ttl_dns_cache=300,  # DNS cache TTL
+                limit=200,  # Total connection pool size
+                limit_per_host=32,  # Max connections per host (entries are prepared concurrently)
+                ttl_dns_cache=600,  # DNS cache TTL
                 use_dns_cache=True,
+                keepalive_timeout=60,
             )
             timeout = aiohttp.ClientTimeout(total=config.request_timeout)
             self._session = aiohttp.ClientSession(
@@ -77,9 +115,19 @@ class HTTPSessionManager:
                 timeout=timeout,
                 headers={'User-Agent': 'Discord-RSS-Bot/1.0'}
             )
+        return self._session
+
+    async def start(self) -> None:
+        """Create the session up front so the first poll doesn't pay for it"""
+        self._ensure_session()
+
+    @asynccontextmanager
+    async def get_session(self):
+        """Get or create HTTP session"""
+        session = self._ensure_session()
         
         try:
-            yield self._session
+            yield session
         except Exception:
             # Don't close session on error, just re-raise
             raise
@@ -95,8 +143,26 @@ session_manager = HTTPSessionManager()
 
 # --- IMAGE COLOR UTILS -------------------------------------------------------
 
+# 255 where a pixel passes the _is_valid_color thresholds, applied per channel extreme
+_NOT_DARK_LUT = [0 if v < 30 else 255 for v in range(256)]    # on the brightest channel
+_NOT_LIGHT_LUT = [0 if v > 230 else 255 for v in range(256)]  # on the darkest channel
+# Keep 5 bits per channel (32 levels) so JPEG noise collapses into shared buckets
+_QUANT_5BIT_LUT = [v & 0xF8 for v in range(256)] * 3
+
+class _TransientImageError(Exception):
+    """Image fetch failed for a reason worth retrying; the result must not be cached"""
+
+
 class ColorExtractor:
     """Utility class for extracting dominant colors from images"""
+
+    PALETTE_SIZE = 8  # colors kept by the adaptive palette before picking the dominant one
+    CACHE_SIZE = 512
+    CACHE_TTL = 3600  # seconds
+    MAX_IMAGE_BYTES = 5 * 1024 * 1024  # images announced larger than this are skipped
+    IMAGE_RANGE_BYTES = 1024 * 1024  # bytes requested per image; enough for a dominant color
+    # image URL -> (expires_at monotonic, (r, g, b) or None); feed logos and thumbnails recur a lot
+    _cache: "OrderedDict[str, Tuple[float, Optional[Tuple[int, int, int]]]]" = OrderedDict()
     
     @staticmethod
     def _is_valid_color(rgb: Tuple[int, int, int]) -> bool:
@@ -112,15 +178,44 @@ class ColorExtractor:
     
     @staticmethod
     async def extract_dominant_color(image_url: str) -> Optional[Color]:
-        """Extract dominant color from an image URL"""
+        """Extract dominant color from an image URL (cached per URL)"""
         if not image_url:
             return None
-            
+
+        cache = ColorExtractor._cache
+        cached = cache.get(image_url)
+        if cached is not None and cached[0] > time.monotonic():
+            cache.move_to_end(image_url)
+            rgb = cached[1]
+        else:
+            try:
+                rgb = await ColorExtractor._extract_rgb(image_url)
+            except _TransientImageError:
+                # Not cached: the next entry using this image retries the download
+                return None
+            # Store the bare (r, g, b) tuple, or None for unusable images, so repeats skip the download too
+            cache[image_url] = (time.monotonic() + ColorExtractor.CACHE_TTL, rgb)
+            cache.move_to_end(image_url)
+            while len(cache) > ColorExtractor.CACHE_SIZE:
+                cache.popitem(last=False)
+
+        return Color.from_rgb(*rgb) if rgb else None
+
+    @staticmethod
+    async def _extract_rgb(image_url: str) -> Optional[Tuple[int, int, int]]:
+        """Download an image and return its dominant (r, g, b), or None for unusable images.
+
+        Raises _TransientImageError for failures worth retrying (network errors, 429/5xx).
+        """
         try:
             async with session_manager.get_session() as session:
-                async with session.get(image_url) as resp:
-                    if resp.status != 200:
+                # One ranged GET: headers reject oversize / non-image URLs before the body is paid for
+                headers = {'Range': f"bytes=0-{ColorExtractor.IMAGE_RANGE_BYTES - 1}"}
+                async with session.get(image_url, headers=headers) as resp:
+                    if resp.status not in (200, 206):
                         logger.debug(f"Failed to fetch image: {image_url} (status: {resp.status})")
+                        if resp.status == 429 or resp.status >= 500:
+                            raise _TransientImageError(resp.status)
                         return None
                     
                     # Check content type
@@ -129,32 +224,23 @@ class ColorExtractor:
                         logger.debug(f"URL is not an image: {image_url}")
                         return None
                     
-                    image_data = await resp.read()
-                    
-                    # Limit image size to prevent memory issues
-                    if len(image_data) > 5 * 1024 * 1024:  # 5MB limit
-                        logger.debug(f"Image too large: {len(image_data)} bytes")
+                    # Full size comes from Content-Range on partial responses, Content-Length otherwise
+                    content_range = resp.headers.get('content-range', '')
+                    total = content_range.rpartition('/')[2] if resp.status == 206 else resp.headers.get('content-length')
+                    if total and total.isdigit() and int(total) > ColorExtractor.MAX_IMAGE_BYTES:
+                        logger.debug(f"Image too large: {total} bytes")
                         return None
+                    
+                    image_data = await _read_capped(resp, ColorExtractor.IMAGE_RANGE_BYTES)
 
-            # Process image
-            with Image.open(BytesIO(image_data)) as image:
-                # Convert to RGB and resize for faster processing
-                rgb_image = image.convert("RGB")
-                resized = rgb_image.resize(config.image_resize_dimensions, Image.Resampling.LANCZOS)
-                
-                # Get pixel data and filter out invalid colors
-                pixels = list(resized.getdata())
-                valid_pixels = [p for p in pixels if ColorExtractor._is_valid_color(p)]
-                
-                if not valid_pixels:
-                    return None
-                
-                # Find most common color
-                color_counts = Counter(valid_pixels)
-                dominant_color = color_counts.most_common(1)[0][0]
-                
-                return Color.from_rgb(*dominant_color)
+            # Decoding and quantizing are CPU-bound: keep them off the event loop
+            return await asyncio.to_thread(ColorExtractor._dominant_rgb, image_data)
 
+        except _TransientImageError:
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"Network error fetching image {image_url}: {e!r}")
+            raise _TransientImageError(e) from e
         except UnidentifiedImageError:
             logger.debug(f"Could not identify image format: {image_url}")
         except Exception as e:
@@ -162,6 +248,78 @@ class ColorExtractor:
         
         return None
 
+    @staticmethod
+    def _open_draft(image_data: bytes) -> Image.Image:
+        """Open image bytes, letting JPEG decode at reduced size"""
+        image = Image.open(BytesIO(image_data))
+        width, height = config.image_resize_dimensions
+        image.draft("RGB", (width * 2, height * 2))
+        return image
+
+    @staticmethod
+    def _decode_rgb(image_data: bytes) -> Optional[Image.Image]:
+        """Decode image bytes to RGB, keeping only the decoded rows of a truncated (ranged) download"""
+        with ColorExtractor._open_draft(image_data) as image:
+            try:
+                image.load()
+                return image.convert("RGB")
+            except OSError:
+                # Only the head of large images is downloaded; fall back to a truncated decode below
+                pass
+
+        with ColorExtractor._open_draft(image_data) as image:
+            with _TRUNCATED_DECODE_LOCK:
+                ImageFile.LOAD_TRUNCATED_IMAGES = True
+                try:
+                    image.load()
+                finally:
+                    ImageFile.LOAD_TRUNCATED_IMAGES = False
+            rgb_image = image.convert("RGB")
+
+        # Rows past the end of the data are a flat filler (grey for JPEG, black otherwise), which
+        # ends at the bottom-right pixel; crop to the last row that differs from it
+        filler = Image.new("RGB", rgb_image.size, rgb_image.getpixel((rgb_image.width - 1, rgb_image.height - 1)))
+        bbox = ImageChops.difference(rgb_image, filler).getbbox()
+        if bbox is None:
+            rgb_image.close()
+            return None
+        return rgb_image.crop((0, 0, rgb_image.width, bbox[3]))
+
+    @staticmethod
+    def _dominant_rgb(image_data: bytes) -> Optional[Tuple[int, int, int]]:
+        """Decode image bytes and return the dominant valid (r, g, b), or None (runs in a worker thread)"""
+        rgb_image = ColorExtractor._decode_rgb(image_data)
+        if rgb_image is None:
+            return None
+        with rgb_image:
+            # Bilinear is enough since only colors matter, not edges
+            rgb_image.thumbnail(config.image_resize_dimensions, Image.Resampling.BILINEAR)
+
+            # Adaptive palette quantization runs in C on the 5-bit image; only the few palette colors reach Python
+            quantized = rgb_image.point(_QUANT_5BIT_LUT)
+            paletted = quantized.convert("P", palette=Image.Palette.ADAPTIVE, colors=ColorExtractor.PALETTE_SIZE)
+            palette = paletted.getpalette()
+
+            # Per-pixel validity mask built with C-level channel min/max and lookup tables,
+            # so near-black / near-white pixels are excluded from the counts
+            r, g, b = rgb_image.split()
+            not_dark = ImageChops.lighter(ImageChops.lighter(r, g), b).point(_NOT_DARK_LUT)
+            not_light = ImageChops.darker(ImageChops.darker(r, g), b).point(_NOT_LIGHT_LUT)
+            valid_mask = ImageChops.darker(not_dark, not_light)
+            # histogram() is the C-level bincount over palette indices; only the first
+            # PALETTE_SIZE of its 256 buckets can be populated
+            counts = paletted.histogram(mask=valid_mask)[:ColorExtractor.PALETTE_SIZE]
+
+            # Most frequent palette color among valid pixels
+            for count, index in sorted(zip(counts, range(len(counts))), reverse=True):
+                if not count:
+                    break
+                rgb = tuple(palette[index * 3:index * 3 + 3])
+                if ColorExtractor._is_valid_color(rgb):
+                    return rgb
+
+            return None
+
 # --- MINIFLUX API CLIENT -----------------------------------------------------
 
 class MinifluxClient:
@@ -192,7 +350,7 @@ class MinifluxClient:
                         error_text = await resp.text()
                         raise MinifluxError(f"API error {resp.status}: {error_text}")
                     
-                    data = await resp.json()
+                    data = _json_loads(await resp.read())
                     entries = data.get("entries", [])
                     logger.info(f"Fetched {len(entries)} unread entries")
                     return entries
@@ -215,7 +373,7 @@ class MinifluxClient:
         
         try:
             async with session_manager.get_session() as session:
-                async with session.put(url, headers=self._headers, json=payload) as resp:
+                async with session.put(url, headers=self._headers, data=_json_dumps(payload)) as resp:
                     if resp.status == 204:
                         logger.debug(f"Marked {len(entry_ids)} entries as read")
                         return True
@@ -229,6 +387,11 @@ class MinifluxClient:
 
 # --- WEB SCRAPER -------------------------------------------------------------
 
+SCRAPE_CACHE_TTL = 900  # seconds
+SCRAPE_CACHE_MAX = 256
+# article URL -> (stored_at monotonic, (content, image_url)); syndicated articles show up in several feeds
+_SCRAPE_CACHE: Dict[str, Tuple[float, Tuple[Optional[str], Optional[str]]]] = {}
+
 class WebScraper:
     """Web scraper for extracting article content and images"""
     
@@ -238,8 +401,13 @@ class WebScraper:
         '.article-content', '.content', 'main'
     ]
     
+    MAX_HTML_BYTES = 256 * 1024  # bytes of article HTML read per page
+    
     # Tags to remove during scraping
     UNWANTED_TAGS = ['script', 'style', 'nav', 'header', 'footer', 'aside', 'ad', '.advertisement']
+
+    # Removal order doesn't matter, so unwanted tags go in one combined walk
+    UNWANTED_SELECTOR = ','.join(UNWANTED_TAGS)
     
     @staticmethod
     def _clean_url(url: str, base_url: str = "") -> str:
@@ -278,11 +446,10 @@ class WebScraper:
     def _extract_content_text(soup: BeautifulSoup) -> str:
         """Extract clean text content from soup"""
         # Remove unwanted tags
-        for selector in WebScraper.UNWANTED_TAGS:
-            for tag in soup.select(selector):
-                tag.decompose()
+        for tag in soup.select(WebScraper.UNWANTED_SELECTOR):
+            tag.decompose()
         
-        # Try to find main content area
+        # Try to find main content area, in selector priority order
         content_area = None
         for selector in WebScraper.CONTENT_SELECTORS:
             content_area = soup.select_one(selector)
@@ -293,16 +460,15 @@ class WebScraper:
         if not content_area:
             content_area = soup.find('body') or soup
         
-        # Extract paragraphs
+        # Extract paragraphs; inline tags are joined with spaces so each <p> stays one paragraph
         paragraphs = []
         for p in content_area.find_all('p'):
-            text = p.get_text(strip=True)
+            text = p.get_text(' ', strip=True)
             if len(text) >= config.min_paragraph_length:
                 paragraphs.append(text)
-            
-            # Limit to first few paragraphs for performance
-            if len(paragraphs) >= 3:
-                break
+                # Limit to first few paragraphs for performance
+                if len(paragraphs) >= 3:
+                    break
         
         if not paragraphs:
             # Fallback: get any text
@@ -312,12 +478,24 @@ class WebScraper:
         combined_text = ' '.join(paragraphs)
         return combined_text[:config.max_description_length] + "..." if len(combined_text) > config.max_description_length else combined_text
     
+    @staticmethod
+    def _parse_article(html: str) -> Tuple[str, Optional[str]]:
+        """Parse article HTML into (content text, meta image)"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+        
+        # Extract content and image
+        return WebScraper._extract_content_text(soup), WebScraper._extract_meta_image(soup)
+    
     @staticmethod
     async def scrape_article(url: str) -> Tuple[Optional[str], Optional[str]]:
         """Scrape article content and image from URL"""
         if not url:
             return None, None
         
+        cached = _SCRAPE_CACHE.get(url)
+        if cached is not None and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL:
+            return cached[1]
+        
         try:
             async with session_manager.get_session() as session:
                 async with session.get(url) as resp:
@@ -325,19 +503,29 @@ class WebScraper:
                         logger.debug(f"Failed to scrape {url}: status {resp.status}")
                         return None, None
                     
-                    html = await resp.text()
-            
-            soup = BeautifulSoup(html, 'html.parser')
+                    # Skip binaries/attachments and only read the head of bloated pages:
+                    # the description is cut to a few hundred chars anyway
+                    content_type = resp.headers.get('content-type', '')
+                    if 'html' not in content_type:
+                        logger.debug(f"Not scraping non-HTML {url} ({content_type})")
+                        return None, None
+                    raw = await _read_capped(resp, WebScraper.MAX_HTML_BYTES)
+                    html = raw.decode(resp.charset or 'utf-8', errors='replace')
             
-            # Extract content and image
-            content = WebScraper._extract_content_text(soup)
-            image_url = WebScraper._extract_meta_image(soup)
+            # Parsing up to MAX_HTML_BYTES of markup is CPU-bound: keep it off the event loop
+            content, image_url = await asyncio.to_thread(WebScraper._parse_article, html)
             
             # Clean image URL
             if image_url:
                 from urllib.parse import urljoin
                 image_url = urljoin(url, image_url)
             
+            # FIFO eviction: dicts keep insertion order, so the first key is the oldest entry
+            _SCRAPE_CACHE.pop(url, None)
+            _SCRAPE_CACHE[url] = (time.monotonic(), (content, image_url))
+            while len(_SCRAPE_CACHE) > SCRAPE_CACHE_MAX:
+                del _SCRAPE_CACHE[next(iter(_SCRAPE_CACHE))]
+            
             return content, image_url
             
         except Exception as e:
@@ -346,17 +534,16 @@ class WebScraper:
 
 # --- CONTENT PROCESSOR -------------------------------------------------------
 
+DEFAULT_DESC = "Aucun contenu disponible"
+EMBED_TITLE_MAX_CHARS = 256  # Discord title limit
+OFFLOAD_PARSE_CHARS = 20_000  # entry bodies larger than this are parsed in a worker thread
+
 class ContentProcessor:
     """Processes RSS entries into Discord embeds"""
     
     @staticmethod
-    def clean_html_content(html_content: str) -> str:
-        """Clean HTML content and extract plain text"""
-        if not html_content:
-            return ""
-        
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+    def _soup_text(soup: BeautifulSoup) -> str:
+        """Extract plain, truncated text from a parsed HTML body"""
         # Remove unwanted tags
         for tag in soup(['script', 'style', 'nav', 'header', 'footer']):
             tag.decompose()
@@ -365,174 +552,236 @@ class ContentProcessor:
         text = soup.get_text(separator=' ', strip=True)
         
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WS_RE.sub(' ', text).strip()
         
         return text[:config.max_description_length] + "..." if len(text) > config.max_description_length else text
     
     @staticmethod
-    def extract_entry_image(entry: Dict[str, Any]) -> Optional[str]:
-        """Extract image URL from RSS entry"""
-        # Check enclosures first
-        for enclosure in entry.get('enclosures', []):
-            mime_type = enclosure.get('mime_type', '')
-            if mime_type.startswith('image/'):
-                return enclosure.get('url')
-        
-        # Check content fields
-        for field in ['content', 'summary', 'description']:
-            if field not in entry:
-                continue
-                
-            soup = BeautifulSoup(entry[field], 'html.parser')
-            img = soup.find('img')
-            if img and img.get('src'):
-                return img.get('src')
-        
-        return None
+    def _parse_entry_body(entry: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+        """Return (description, image_src) for an entry, parsing each HTML field at most once"""
+        soups: Dict[str, Optional[BeautifulSoup]] = {}
+
+        def soup_for(field: str) -> Optional[BeautifulSoup]:
+            if field not in soups:
+                soups[field] = BeautifulSoup(entry[field], HTML_PARSER) if entry.get(field) else None
+            return soups[field]
+
+        # Image first: enclosures, then the first <img> of the body fields (before tags get decomposed)
+        image_src = None
+        for enclosure in entry.get('enclosures') or []:
+            if enclosure.get('mime_type', '').startswith('image/'):
+                image_src = enclosure.get('url')
+                break
+        else:
+            for field in ['content', 'summary', 'description']:
+                soup = soup_for(field)
+                img = soup.find('img') if soup else None
+                if img and img.get('src'):
+                    image_src = img.get('src')
+                    break
+
+        # Description from the summary, falling back to the full content
+        description = ""
+        for field in ['summary', 'content']:
+            soup = soup_for(field)
+            if soup:
+                description = ContentProcessor._soup_text(soup)
+                if description:
+                    break
+
+        return description, image_src
     
     @staticmethod
     async def process_entry(entry: Dict[str, Any]) -> Embed:
         """Process RSS entry into Discord embed"""
         # Basic entry info
-        title = entry.get('title', 'Article sans titre')[:256]  # Discord title limit
+        title = entry.get('title', 'Article sans titre')[:EMBED_TITLE_MAX_CHARS]
         url = entry.get('url', '')
         
-        # Get description
-        description = ""
-        for field in ['summary', 'content']:
-            if field in entry:
-                description = ContentProcessor.clean_html_content(entry[field])
-                if description:
-                    break
-        
-        # Get image
-        image_url = ContentProcessor.extract_entry_image(entry)
+        # Get description and image from a single parse of the entry body
+        body_size = sum(len(entry.get(field) or '') for field in ('content', 'summary', 'description'))
+        if body_size > OFFLOAD_PARSE_CHARS:
+            description, image_url = await asyncio.to_thread(ContentProcessor._parse_entry_body, entry)
+        else:
+            description, image_url = ContentProcessor._parse_entry_body(entry)
         
         # Scrape if description is too short or missing
         needs_scraping = not description or len(description) < config.min_paragraph_length
+        extracted_color = None
+        color_done = False
         if needs_scraping and url:
             logger.debug(f"Scraping additional content for: {title}")
-            scraped_content, scraped_image = await WebScraper.scrape_article(url)
-            
-            if scraped_content:
-                description = scraped_content
-            if scraped_image and not image_url:
-                image_url = scraped_image
+            # The article page and the already-known image live on different hosts: fetch both at once
+            tasks = [WebScraper.scrape_article(url)]
+            if image_url:
+                tasks.append(ColorExtractor.extract_dominant_color(image_url))
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+            scraped = results[0]
+            if isinstance(scraped, BaseException):
+                logger.debug(f"Scraping failed: {scraped}")
+            else:
+                scraped_content, scraped_image = scraped
+                if scraped_content:
+                    description = scraped_content
+                if scraped_image and not image_url:
+                    image_url = scraped_image
+
+            if len(results) > 1:
+                color_done = True
+                if isinstance(results[1], BaseException):
+                    logger.debug(f"Color extraction failed: {results[1]}")
+                else:
+                    extracted_color = results[1]
         
-        # Extract dominant color from image
-        embed_color = Color.default()
-        if image_url:
+        # Extract dominant color from image (unless it already ran alongside the scrape)
+        if image_url and not color_done:
             try:
                 extracted_color = await ColorExtractor.extract_dominant_color(image_url)
-                if extracted_color:
-                    embed_color = extracted_color
             except Exception as e:
                 logger.debug(f"Color extraction failed: {e}")
         
-        # Create embed
-        embed = Embed(
-            title=title,
-            url=url,
-            description=description or "Aucun contenu disponible",
-            color=embed_color
-        )
+        # Assemble the raw payload and hand it to Embed.from_dict in one call
+        payload = {
+            "title": title,
+            "url": url,
+            "description": description or DEFAULT_DESC,
+            "color": extracted_color.value if extracted_color else 0,
+        }
         
         # Add feed info
-        feed_info = entry.get('feed', {})
-        if feed_info.get('title'):
-            embed.set_author(name=feed_info['title'])
+        feed_title = (entry.get('feed') or {}).get('title')
+        if feed_title:
+            payload["author"] = {"name": feed_title}
         
         # Add image
         if image_url:
             # Ensure proper protocol
             if image_url.startswith('//'):
                 image_url = f'https:{image_url}'
-            embed.set_image(url=image_url)
+            payload["image"] = {"url": image_url}
         
-        return embed
+        return Embed.from_dict(payload)
 
 # --- DISCORD POSTER ----------------------------------------------------------
 
+PREPARE_CONCURRENCY = 5  # entries whose embeds are built in parallel
+NEWS_DB_PATH = "data/news.db"
+SQL_UPSERT_NEWS_ENTRY = (
+    "INSERT OR REPLACE INTO news_entries (entry_id, source, source_entry_id, url, title, summary, content, "
+    "image_url, published_at, posted_at, extra_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
 class DiscordPoster:
     """Handles posting to Discord"""
     
     def __init__(self, bot):
         self.bot = bot
         self.miniflux_client = MinifluxClient()
+        self._db: Optional[aiosqlite.Connection] = None
+        self._pending_rows: List[tuple] = []
+
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Open the news DB once for the loop's lifetime"""
+        if self._db is None:
+            os.makedirs(os.path.dirname(NEWS_DB_PATH), exist_ok=True)
+            self._db = await aiosqlite.connect(NEWS_DB_PATH)
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            await self._db.execute("PRAGMA synchronous=NORMAL")
+        return self._db
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    @staticmethod
+    def _news_row(entry: Dict[str, Any], embed: Embed) -> tuple:
+        """Build the news_entries row for a posted entry"""
+        # Derive an entry_id: prefer Miniflux id if present, else use URL
+        if entry.get('id'):
+            entry_id = f"miniflux:{entry.get('id')}"
+        else:
+            entry_id = f"url:{entry.get('url') or entry.get('guid') or ''}"
+
+        # Extract fields from processed embed and raw entry
+        title = embed.title or entry.get('title') or ''
+        url = embed.url or entry.get('url') or ''
+        summary = embed.description or None
+        # We don't have embed.content separate; use summary for now. If you later want full HTML, adapt ContentProcessor to return it.
+        image_url = None
+        try:
+            if embed.image and embed.image.url:
+                image_url = embed.image.url
+        except Exception:
+            image_url = None
+
+        published_at = None
+        try:
+            # Miniflux may provide published_at as an ISO string or numeric timestamp
+            pa = entry.get('published_at') or entry.get('published') or None
+            if isinstance(pa, (int, float)):
+                published_at = int(pa)
+            elif isinstance(pa, str):
+                # try ISO parse to timestamp
+                try:
+                    published_at = int(datetime.datetime.fromisoformat(pa).timestamp())
+                except Exception:
+                    published_at = None
+        except Exception:
+            published_at = None
+
+        return (
+            str(entry_id),
+            'miniflux',
+            str(entry.get('id')) if entry.get('id') is not None else None,
+            url,
+            title,
+            summary,
+            None,
+            image_url,
+            published_at,
+            time.time_ns() // 1_000_000,
+            None,
+        )
+
+    async def _flush_news_rows(self) -> None:
+        """Upsert every pending news row with one executemany and a single commit"""
+        if not self._pending_rows:
+            return
+        rows, self._pending_rows = self._pending_rows, []
+        try:
+            db = await self._get_db()
+            await db.executemany(SQL_UPSERT_NEWS_ENTRY, rows)
+            await db.commit()
+        except Exception:
+            logger.exception(f"Failed to persist {len(rows)} news entries to {NEWS_DB_PATH}")
+            # Keep them for the next flush instead of dropping them
+            self._pending_rows[:0] = rows
+
+    def _queue_news_row(self, entry: Dict[str, Any], embed: Embed) -> None:
+        try:
+            self._pending_rows.append(self._news_row(entry, embed))
+        except Exception as e:
+            logger.debug(f"Error preparing news DB upsert: {e}")
     
-    async def post_entry(self, entry: Dict[str, Any]) -> bool:
-        """Post a single entry to Discord"""
+    async def post_entry(self, entry: Dict[str, Any], embed: Optional[Embed] = None) -> bool:
+        """Post a single entry to Discord.
+
+        A prepared embed means its news_entries row was already written (process_entries stores
+        the whole batch before sending); otherwise the row is written here before the send.
+        """
         channel = self.bot.get_channel(config.discord_channel_id)
         if not channel:
             logger.error(f"Discord channel {config.discord_channel_id} not found")
             return False
         
         try:
-            embed = await ContentProcessor.process_entry(entry)
-            # Persist canonical entry in data/news.db so bookmarks can later reference full content
-            try:
-                # Derive an entry_id: prefer Miniflux id if present, else use URL
-                entry_id = None
-                if entry.get('id'):
-                    entry_id = f"miniflux:{entry.get('id')}"
-                else:
-                    entry_id = f"url:{entry.get('url') or entry.get('guid') or ''}"
-
-                # Extract fields from processed embed and raw entry
-                title = embed.title or entry.get('title') or ''
-                url = embed.url or entry.get('url') or ''
-                summary = embed.description or None
-                # We don't have embed.content separate; use summary for now. If you later want full HTML, adapt ContentProcessor to return it.
-                image_url = None
-                try:
-                    if embed.image and embed.image.url:
-                        image_url = embed.image.url
-                except Exception:
-                    image_url = None
-
-                published_at = None
-                try:
-                    # Miniflux may provide published_at as an ISO string or numeric timestamp
-                    pa = entry.get('published_at') or entry.get('published') or None
-                    if isinstance(pa, (int, float)):
-                        published_at = int(pa)
-                    elif isinstance(pa, str):
-                        # try ISO parse to timestamp
-                        from datetime import datetime as _dt
-                        try:
-                            dt = _dt.fromisoformat(pa)
-                            published_at = int(dt.timestamp())
-                        except Exception:
-                            published_at = None
-                except Exception:
-                    published_at = None
-
-                # Upsert into news.db
-                import aiosqlite
-                db_path = "data/news.db"
-                try:
-                    async with aiosqlite.connect(db_path) as db:
-                        await db.execute(
-                            "INSERT OR REPLACE INTO news_entries (entry_id, source, source_entry_id, url, title, summary, content, image_url, published_at, posted_at, extra_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                            (
-                                str(entry_id),
-                                'miniflux',
-                                str(entry.get('id')) if entry.get('id') is not None else None,
-                                url,
-                                title,
-                                summary,
-                                None,
-                                image_url,
-                                published_at,
-                                __import__('datetime').datetime.now().isoformat(),
-                                None,
-                            ),
-                        )
-                        await db.commit()
-                except Exception:
-                    logger.debug("Failed to persist news entry to data/news.db")
-            except Exception as e:
-                logger.debug(f"Error preparing news DB upsert: {e}")
+            if embed is None:
+                embed = await ContentProcessor.process_entry(entry)
+                # The bookmark button re-reads news_entries on click, so the row must exist before the send
+                self._queue_news_row(entry, embed)
+                await self._flush_news_rows()
 
             # Try to attach a per-user bookmark button view if BookmarkManager is available
             bookmark_cog = self.bot.get_cog('BookmarkManager')
@@ -556,25 +805,46 @@ class DiscordPoster:
             logger.error(f"Failed to post entry {entry.get('id')}: {e}")
             return False
     
-    async def process_entries(self) -> None:
-        """Fetch and process all unread entries"""
+    async def process_entries(self, entries: Optional[List[Dict[str, Any]]] = None) -> int:
+        """Process unread entries (fetched here unless given), returning how many were posted"""
+        posted_entry_ids = []
         try:
-            entries = await self.miniflux_client.fetch_unread_entries()
+            if entries is None:
+                entries = await self.miniflux_client.fetch_unread_entries()
             
             if not entries:
                 logger.debug("No unread entries found")
-                return
-            
-            posted_entry_ids = []
+                return 0
             
-            for entry in entries:
-                success = await self.post_entry(entry)
+            # Scraping / image work is independent per entry: prepare all embeds concurrently,
+            # then post sequentially to respect Discord rate limits
+            sem = asyncio.Semaphore(PREPARE_CONCURRENCY)
+
+            async def prepare(entry: Dict[str, Any]) -> Optional[Embed]:
+                async with sem:
+                    try:
+                        return await ContentProcessor.process_entry(entry)
+                    except Exception as e:
+                        logger.debug(f"Failed to prepare entry {entry.get('id')}: {e}")
+                        return None
+
+            embeds = await asyncio.gather(*(prepare(entry) for entry in entries))
+
+            # Persist canonical entries in data/news.db (one executemany) before anything is sent:
+            # the bookmark button re-reads the row on click
+            for entry, embed in zip(entries, embeds):
+                if embed is not None:
+                    self._queue_news_row(entry, embed)
+            await self._flush_news_rows()
+
+            for entry, embed in zip(entries, embeds):
+                success = await self.post_entry(entry, embed)
                 if success:
                     posted_entry_ids.append(entry.get('id'))
                 
                 # Rate limiting
                 await asyncio.sleep(config.request_delay)
-            
+
             # Mark successfully posted entries as read
             if posted_entry_ids:
                 await self.miniflux_client.mark_as_read(posted_entry_ids)
@@ -584,6 +854,7 @@ class DiscordPoster:
             logger.error(f"Miniflux error: {e}")
         except Exception as e:
             logger.error(f"Unexpected error processing entries: {e}")
+        return len(posted_entry_ids)
 
 # --- MAIN LOOP ---------------------------------------------------------------
 
@@ -594,29 +865,42 @@ async def run_miniflux_loop(bot) -> None:
     # Wait for bot to be ready
     await asyncio.sleep(5)
     
+    await session_manager.start()
     poster = DiscordPoster(bot)
     
-    while True:
-        try:
-            entries_before = await poster.miniflux_client.fetch_unread_entries()
-            entry_count_before = len(entries_before)
-            
-            # Process entries
-            await poster.process_entries()
-            
-            # Determine sleep interval based on activity
-            if entry_count_before > 0:
-                sleep_time = config.fetch_interval_with_entries
-                logger.debug(f"Processed {entry_count_before} entries, sleeping for {sleep_time}s")
-            else:
-                sleep_time = config.fetch_interval_no_entries
-                logger.debug(f"No entries found, sleeping for {sleep_time}s")
-            
-            await asyncio.sleep(sleep_time)
-            
-        except Exception as e:
-            logger.exception(f"RSS loop crashed: {e}")
-            await asyncio.sleep(60)  # Wait before retrying
+    try:
+        idle_polls = 0
+        while True:
+            try:
+                try:
+                    entries = await poster.miniflux_client.fetch_unread_entries()
+                except MinifluxError as e:
+                    logger.error(f"Miniflux error: {e}")
+                    entries = []
+                posted = await poster.process_entries(entries)
+
+                # Poll quickly while feeds are active, back off exponentially when they are quiet
+                if posted > 0:
+                    idle_polls = 0
+                    sleep_time = config.fetch_interval_with_entries
+                    logger.debug(f"Processed {posted} entries, sleeping for {sleep_time}s")
+                else:
+                    sleep_time = min(
+                        config.fetch_interval_no_entries * config.idle_backoff_factor ** (idle_polls + 1),
+                        config.max_idle_interval,
+                    )
+                    # Stop counting once capped so the power never overflows on long quiet spells
+                    if sleep_time < config.max_idle_interval:
+                        idle_polls += 1
+                    logger.debug(f"No entries posted ({idle_polls} idle polls), sleeping for {sleep_time:.0f}s")
+
+                await asyncio.sleep(sleep_time * random.uniform(0.8, 1.2))
+
+            except Exception as e:
+                logger.exception(f"RSS loop crashed: {e}")
+                await asyncio.sleep(60)  # Wait before retrying
+    finally:
+        await poster.close()
 
 # --- CLEANUP -----------------------------------------------------------------
 
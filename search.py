@@ -1,53 +1,109 @@
+import asyncio
 import logging
+import time
+from itertools import islice
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from typing import List, Dict, Any, Optional
-from igdb import IGDB, IGDBError
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+from igdb import IGDB, IGDBError, platform_choices, single_flight
 from wishlist import WishlistManager
-from ui_components import GameEmbedView, EnhancedPaginatorView
+from ui_components import GameEmbedView, EnhancedPaginatorView, LazyEmbedList
 
 logger = logging.getLogger(__name__)
 
+SEARCH_CACHE_TTL = 3600  # 1 hour; search results for a title barely change
+SEARCH_CACHE_MAX = 512
+EMBED_CACHE_MAX = 2048  # rendered search embeds, keyed by IGDB game id (same TTL as search results)
+
+_QUERY_FIELDS = (
+    'fields name, slug, cover.url, first_release_date, platforms.name, '
+    'platforms.id, summary, rating, genres.name, involved_companies.company.name;'
+)
+_QUERY_TMPL = _QUERY_FIELDS + 'search "%s";limit 25;'
+# Syntaxe correcte pour filtrer par plateforme
+_QUERY_TMPL_PLATFORM = _QUERY_FIELDS + 'search "%s";where platforms = [%d];limit 25;'
+# A '"' or '\' in the game name must not terminate the search string early
+_QUERY_ESCAPE = str.maketrans({'\\': '\\\\', '"': '\\"', '\n': ' '})
+
+def _fix_cover(url: str) -> str:
+    """HTTPS, full-size variant of an IGDB cover URL (IGDB returns protocol-relative t_thumb URLs)"""
+    if url[:2] == "//":
+        url = "https:" + url
+    return url.replace("t_thumb", "t_cover_big", 1)
+
 class GameSearch(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.igdb_cog: Optional[IGDB] = None
-        self.wishlist_manager: Optional[WishlistManager] = None
+        # (normalized name, platform_id) -> (expires_at monotonic, games)
+        self._search_cache: "OrderedDict[Tuple[str, Optional[int]], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Optional[int]], asyncio.Task] = {}
+        # game id -> (expires_at monotonic, embed.to_dict())
+        self._embed_cache: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     async def cog_load(self):
-        """Initialize dependencies"""
-        self.igdb_cog = self.bot.get_cog('IGDB')
-        self.wishlist_manager = self.bot.get_cog('WishlistManager')
         logger.info("🔍 Game Search Cog loaded")
 
-    def _build_search_query(self, game_name: str, platform_id: Optional[int] = None) -> str:
-        base_fields = (
-            'fields name, slug, cover.url, first_release_date, platforms.name, '
-            'platforms.id, summary, rating, genres.name, involved_companies.company.name;'
-        )
-        
-        search_part = f'search "{game_name}";'
-        limit_part = 'limit 25;'
+    # Dependencies are resolved per use: extensions load concurrently, so they may not exist yet at cog_load
+    @property
+    def igdb_cog(self) -> Optional[IGDB]:
+        return self.bot.get_cog('IGDB')
 
-        if platform_id:
-            # Syntaxe correcte pour filtrer par plateforme
-            where_part = f'where platforms = [{platform_id}];'
-            query = f'{base_fields}{search_part}{where_part}{limit_part}'
-        else:
-            query = f'{base_fields}{search_part}{limit_part}'
+    @property
+    def wishlist_manager(self) -> Optional[WishlistManager]:
+        return self.bot.get_cog('WishlistManager')
 
-        return query
+    def _build_search_query(self, game_name: str, platform_id: Optional[int] = None) -> str:
+        name = game_name.translate(_QUERY_ESCAPE)
+        if platform_id:
+            return _QUERY_TMPL_PLATFORM % (name, platform_id)
+        return _QUERY_TMPL % name
 
     async def _search_games_api(self, game_name: str, platform_id: Optional[int] = None) -> List[Dict[str, Any]]:
         """Search for games using IGDB API"""
         if not self.igdb_cog:
             raise IGDBError("IGDB service not available")
 
+        key = (game_name.strip().casefold(), platform_id)
+        cached = self._search_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            self._search_cache.move_to_end(key)
+            return cached[1]
+
+        # Single-flight: concurrent identical searches share one request
+        return await single_flight(self._inflight, key, lambda: self._do_search(game_name, platform_id, key))
+
+    async def _do_search(self, game_name: str, platform_id: Optional[int], key: tuple) -> List[Dict[str, Any]]:
+        # Errors propagate before anything is stored, so failed searches are retried
         query = self._build_search_query(game_name, platform_id)
-        return await self.igdb_cog._fetch_games_from_api(query)
+        games = await self.igdb_cog._fetch_games_from_api(query)
+
+        self._search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, games)
+        self._search_cache.move_to_end(key)
+        while len(self._search_cache) > SEARCH_CACHE_MAX:
+            self._search_cache.popitem(last=False)
+        return games
 
     def _build_search_embed(self, game: Dict[str, Any]) -> discord.Embed:
+        """Search embed for a game; the same game renders identically for every user"""
+        game_id = game.get("id")
+        cached = self._embed_cache.get(game_id) if game_id else None
+        if cached and cached[0] > time.monotonic():
+            self._embed_cache.move_to_end(game_id)
+            payload = cached[1]
+            # Fresh fields list, so an add_field on one message never leaks into the cache
+            return discord.Embed.from_dict({**payload, "fields": [dict(f) for f in payload.get("fields", [])]})
+
+        embed = self._render_search_embed(game)
+        if game_id:
+            self._embed_cache[game_id] = (time.monotonic() + SEARCH_CACHE_TTL, embed.to_dict())
+            self._embed_cache.move_to_end(game_id)
+            while len(self._embed_cache) > EMBED_CACHE_MAX:
+                self._embed_cache.popitem(last=False)
+        return embed
+
+    def _render_search_embed(self, game: Dict[str, Any]) -> discord.Embed:
         name = game.get("name", "Titre inconnu")
         slug = game.get("slug")
 
@@ -67,10 +123,10 @@ class GameSearch(commands.Cog):
             )
 
         # 🕹️ Plateformes
+        get = dict.get  # bound once for the per-item lookups below
         platforms = game.get("platforms", [])
         if platforms:
-            platform_names = [p.get("name", "Inconnu") for p in platforms[:5]]
-            platform_text = ", ".join(platform_names)
+            platform_text = ", ".join([get(p, "name", "Inconnu") for p in islice(platforms, 5)])
             if len(platforms) > 5:
                 platform_text += f" (+{len(platforms) - 5} autres)"
             embed.add_field(
@@ -82,10 +138,9 @@ class GameSearch(commands.Cog):
         # 🏢 Développeur
         companies = game.get("involved_companies", [])
         if companies:
-            company_names = [c.get("company", {}).get("name", "Inconnu") for c in companies[:2]]
             embed.add_field(
                 name="🏢 Développeur",
-                value=", ".join(company_names),
+                value=", ".join([get(get(c, "company", {}), "name", "Inconnu") for c in islice(companies, 2)]),
                 inline=False
             )
 
@@ -101,10 +156,7 @@ class GameSearch(commands.Cog):
         # 🖼️ Cover
         cover_url = game.get("cover", {}).get("url")
         if cover_url:
-            if cover_url.startswith("//"):
-                cover_url = f"https:{cover_url}"
-            cover_url = cover_url.replace("t_thumb", "t_cover_big")
-            embed.set_image(url=cover_url)
+            embed.set_image(url=_fix_cover(cover_url))
 
         return embed
 
@@ -121,7 +173,14 @@ class GameSearch(commands.Cog):
         await interaction.response.defer()
         
         try:
-            games = await self._search_games_api(game_name, platform_id)
+            # The invoker's wishlist ids come from SQLite while IGDB answers over the network
+            if self.wishlist_manager:
+                games, wishlisted_ids = await asyncio.gather(
+                    self._search_games_api(game_name, platform_id),
+                    self.wishlist_manager.get_user_wishlist_ids(interaction.user.id),
+                )
+            else:
+                games, wishlisted_ids = await self._search_games_api(game_name, platform_id), None
             
             if not games:
                 embed = discord.Embed(
@@ -132,41 +191,33 @@ class GameSearch(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
 
-            # Build embeds with wishlist buttons
-            embeds = []
-            for game in games:
-                embed = self._build_search_embed(game)
-                embeds.append(embed)
+            # Embeds are built on demand as pages are viewed; the first send only needs page 0
+            embeds = LazyEmbedList(games, self._build_search_embed)
             
             if len(embeds) == 1:
                 # Single result with wishlist button
-                view = GameEmbedView(games[0], self.wishlist_manager)
+                view = GameEmbedView(games[0], self.wishlist_manager, wishlisted_ids=wishlisted_ids)
                 await interaction.followup.send(embed=embeds[0], view=view)
             else:
                 # Multiple results with pagination and wishlist buttons
-                view = EnhancedPaginatorView(embeds, games, self.wishlist_manager)
+                view = EnhancedPaginatorView(embeds, games, self.wishlist_manager, wishlisted_ids=wishlisted_ids)
                 await interaction.followup.send(embed=embeds[0], view=view)
                 
         except IGDBError as e:
-            logger.error(f"IGDB error in search command: {e}")
+            logger.error("IGDB error in search command: %s", e)
             await interaction.followup.send(
                 "❌ Erreur lors de la recherche. Veuillez réessayer plus tard."
             )
         except Exception as e:
-            logger.error(f"Unexpected error in search command: {e}")
+            logger.error("Unexpected error in search command: %s", e)
             await interaction.followup.send(
                 "❌ Une erreur inattendue s'est produite. Veuillez réessayer."
             )
 
     @recherche.autocomplete("platform_id")
     async def platform_autocomplete(self, interaction: Interaction, current: str) -> List[app_commands.Choice[int]]:
-        from igdb import PLATFORMS  # Ou place le tableau dans un fichier partagé si besoin
-        current_lower = current.lower()
-        return [
-            app_commands.Choice(name=p["name"], value=p["id"])
-            for p in PLATFORMS
-            if current_lower in p["name"].lower()
-        ][:25]
+        """Provide autocomplete for platform selection"""
+        return list(platform_choices(current.lower()))
 
 
 async def setup(bot: commands.Bot):
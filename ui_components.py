@@ -2,23 +2,52 @@ import discord
 from discord import Interaction
 from datetime import datetime
 from discord.ui import View, Button
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Sequence, Set, Tuple
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 PAGINATION_TIMEOUT = 300  # 5 minutes
 
+
+class LazyEmbedList(Sequence):
+    """List-like view over items that builds each page's embed on first access"""
+
+    def __init__(self, items: List[Dict[str, Any]], builder: Callable[[Dict[str, Any]], discord.Embed]):
+        self._items = items
+        self._builder = builder
+        self._built: Dict[int, discord.Embed] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._items)
+        embed = self._built.get(index)
+        if embed is None:
+            embed = self._builder(self._items[index])
+            self._built[index] = embed
+        return embed
+
 class GameEmbedView(View):
     """Reusable view for single game embeds with wishlist functionality"""
     
-    def __init__(self, game: Dict[str, Any], wishlist_manager, show_wishlist_button: bool = True):
+    def __init__(self, game: Dict[str, Any], wishlist_manager, show_wishlist_button: bool = True,
+                 wishlisted_ids: Optional[Set[int]] = None):
         super().__init__(timeout=PAGINATION_TIMEOUT)
         self.game = game
         self.wishlist_manager = wishlist_manager
         
         if show_wishlist_button and wishlist_manager:
-            self.add_item(WishlistButton(game, wishlist_manager))
+            button = WishlistButton(game, wishlist_manager)
+            # Invoker's wishlist ids, fetched alongside the search, render the initial state for free
+            if wishlisted_ids is not None:
+                button.set_state(game.get("id") in wishlisted_ids)
+            self.add_item(button)
 
     @discord.ui.button(label="🗑️", style=discord.ButtonStyle.danger)
     async def delete_button(self, interaction: Interaction, button: Button):
@@ -29,7 +58,7 @@ class GameEmbedView(View):
 class PaginatorView(View):
     """Base reusable pagination view for embeds"""
     
-    def __init__(self, embeds: List[discord.Embed]):
+    def __init__(self, embeds: Sequence[discord.Embed]):
         super().__init__(timeout=PAGINATION_TIMEOUT)
         self.embeds = embeds
         self.current_page = 0
@@ -119,6 +148,9 @@ class WishlistButton(discord.ui.Button):
             )
             return
 
+        # Acknowledge before touching the database so a slow lookup can't hit the 3 s interaction deadline
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
         try:
             # Check if already in wishlist for THIS specific user
             is_in_wishlist = await self.wishlist_manager.is_in_wishlist(user_id, game_id)
@@ -126,7 +158,7 @@ class WishlistButton(discord.ui.Button):
             if is_in_wishlist:
                 # Show personalized view to remove from wishlist
                 view = PersonalWishlistView(self.game, self.wishlist_manager, user_id, is_in_wishlist=True)
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     f"💖 **{game_name}** est dans votre wishlist !", 
                     view=view, 
                     ephemeral=True
@@ -134,7 +166,7 @@ class WishlistButton(discord.ui.Button):
             else:
                 # Show personalized view to add to wishlist
                 view = PersonalWishlistView(self.game, self.wishlist_manager, user_id, is_in_wishlist=False)
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     f"💝 **{game_name}** n'est pas dans votre wishlist.", 
                     view=view, 
                     ephemeral=True
@@ -142,7 +174,7 @@ class WishlistButton(discord.ui.Button):
         
         except Exception as e:
             logger.error(f"Error handling wishlist button: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ Une erreur s'est produite.", ephemeral=True
             )
 
@@ -162,6 +194,10 @@ class WishlistButton(discord.ui.Button):
             logger.error(f"Error updating wishlist button state: {e}")
             return
 
+        self.set_state(in_wishlist)
+
+    def set_state(self, in_wishlist: bool) -> None:
+        """Apply a known wishlist membership without querying the database"""
         if in_wishlist:
             self.style = discord.ButtonStyle.success
             self.label = "💖 Dans votre wishlist"
@@ -210,6 +246,9 @@ class AddToWishlistButton(discord.ui.Button):
             
         game_name = self.game.get("name", "ce jeu")
         
+        # Acknowledge first; the result replaces the message once the write is done
+        await interaction.response.defer()
+
         try:
             success = await self.wishlist_manager.add_to_wishlist(self.user_id, self.game)
             
@@ -218,18 +257,18 @@ class AddToWishlistButton(discord.ui.Button):
                 self.view.clear_items()
                 self.view.add_item(RemoveFromWishlistButton(self.game, self.wishlist_manager, self.user_id))
                 
-                await interaction.response.edit_message(
+                await interaction.edit_original_response(
                     content=f"✅ **{game_name}** ajouté à votre wishlist !",
                     view=self.view
                 )
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Erreur lors de l'ajout à la wishlist.", ephemeral=True
                 )
         
         except Exception as e:
             logger.error(f"Error adding to wishlist: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ Une erreur s'est produite.", ephemeral=True
             )
 
@@ -259,6 +298,9 @@ class RemoveFromWishlistButton(discord.ui.Button):
         game_id = self.game.get("id")
         game_name = self.game.get("name", "ce jeu")
         
+        # Acknowledge first; the result replaces the message once the write is done
+        await interaction.response.defer()
+
         try:
             success = await self.wishlist_manager.remove_from_wishlist(self.user_id, game_id)
             
@@ -267,26 +309,27 @@ class RemoveFromWishlistButton(discord.ui.Button):
                 self.view.clear_items()
                 self.view.add_item(AddToWishlistButton(self.game, self.wishlist_manager, self.user_id))
                 
-                await interaction.response.edit_message(
+                await interaction.edit_original_response(
                     content=f"💔 **{game_name}** retiré de votre wishlist.",
                     view=self.view
                 )
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Erreur lors de la suppression.", ephemeral=True
                 )
         
         except Exception as e:
             logger.error(f"Error removing from wishlist: {e}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "❌ Une erreur s'est produite.", ephemeral=True
             )
 
 class EnhancedPaginatorView(PaginatorView):
     """Extended paginator with additional functionality for games"""
     
-    def __init__(self, embeds: List[discord.Embed], games: List[Dict[str, Any]], 
-                 wishlist_manager, show_wishlist_buttons: bool = True):
+    def __init__(self, embeds: Sequence[discord.Embed], games: List[Dict[str, Any]], 
+                 wishlist_manager, show_wishlist_buttons: bool = True,
+                 wishlisted_ids: Optional[Set[int]] = None):
         super().__init__(embeds)
         self.games = games
         self.wishlist_manager = wishlist_manager
@@ -295,6 +338,8 @@ class EnhancedPaginatorView(PaginatorView):
         # Add wishlist button for the first game if enabled
         if show_wishlist_buttons and wishlist_manager and games:
             self.wishlist_button = WishlistButton(games[0], wishlist_manager)
+            if wishlisted_ids is not None:
+                self.wishlist_button.set_state(games[0].get("id") in wishlisted_ids)
             self.add_item(self.wishlist_button)
 
     async def _update_page(self, interaction: Interaction):
@@ -311,11 +356,13 @@ class EnhancedPaginatorView(PaginatorView):
 class UpcomingReleasesView(PaginatorView):
     """Specialized view for upcoming releases with wishlist functionality"""
     
-    def __init__(self, embeds: List[discord.Embed], games: List[Dict[str, Any]], 
+    def __init__(self, embeds: Sequence[discord.Embed], games: List[Dict[str, Any]], 
                  wishlist_manager):
         super().__init__(embeds)
         self.games = games
         self.wishlist_manager = wishlist_manager
+        # page -> converted wishlist game, so Prev/Next bouncing doesn't redo the conversion
+        self._wishlist_game_cache: Dict[int, Dict[str, Any]] = {}
         
         # Add wishlist button if available
         if wishlist_manager and games:
@@ -323,46 +370,53 @@ class UpcomingReleasesView(PaginatorView):
             # Insert wishlist button before delete button
             self.add_item(self.wishlist_button)
 
+    @staticmethod
+    def _to_wishlist_game(current_game: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert upcoming release format to search format for wishlist"""
+        wishlist_game = {
+            "id": current_game.get("id"),
+            "name": current_game.get("name"),
+            "slug": current_game.get("slug"),
+            "cover": current_game.get("cover"),
+            "first_release_date": None,  # Will be determined from release_dates
+            "platforms": []  # Will be determined from release_dates
+        }
+        
+        # Extract first release date and platforms from release_dates
+        release_dates = current_game.get("release_dates", [])
+        if release_dates:
+            # Earliest dated release
+            dated = [r for r in release_dates if r.get("date")]
+            if dated:
+                wishlist_game["first_release_date"] = min(dated, key=lambda r: r["date"])["date"]
+            
+            # Collect unique platforms
+            platforms = []
+            seen = set()
+            for rd in release_dates:
+                platform = rd.get("platform")
+                if platform:
+                    if isinstance(platform, dict):
+                        platform_name = platform.get("name")
+                    else:
+                        platform_name = str(platform)
+                    
+                    if platform_name and platform_name not in seen:
+                        seen.add(platform_name)
+                        platforms.append({"name": platform_name})
+            
+            wishlist_game["platforms"] = platforms
+        
+        return wishlist_game
+
     async def _update_page(self, interaction: Interaction):
         """Update page and wishlist button for upcoming releases"""
         # Update wishlist button for current game
         if hasattr(self, 'wishlist_button') and self.games:
-            current_game = self.games[self.current_page]
-            # Convert upcoming release format to search format for wishlist
-            wishlist_game = {
-                "id": current_game.get("id"),
-                "name": current_game.get("name"),
-                "slug": current_game.get("slug"),
-                "cover": current_game.get("cover"),
-                "first_release_date": None,  # Will be determined from release_dates
-                "platforms": []  # Will be determined from release_dates
-            }
-            
-            # Extract first release date and platforms from release_dates
-            release_dates = current_game.get("release_dates", [])
-            if release_dates:
-                # Sort by date and get the earliest
-                sorted_releases = sorted(
-                    [r for r in release_dates if r.get("date")],
-                    key=lambda r: r["date"]
-                )
-                if sorted_releases:
-                    wishlist_game["first_release_date"] = sorted_releases[0]["date"]
-                
-                # Collect unique platforms
-                platforms = []
-                for rd in release_dates:
-                    platform = rd.get("platform")
-                    if platform:
-                        if isinstance(platform, dict):
-                            platform_name = platform.get("name")
-                        else:
-                            platform_name = str(platform)
-                        
-                        if platform_name and platform_name not in platforms:
-                            platforms.append({"name": platform_name})
-                
-                wishlist_game["platforms"] = platforms
+            wishlist_game = self._wishlist_game_cache.get(self.current_page)
+            if wishlist_game is None:
+                wishlist_game = self._to_wishlist_game(self.games[self.current_page])
+                self._wishlist_game_cache[self.current_page] = wishlist_game
             
             self.wishlist_button.game = wishlist_game
             await self.wishlist_button.update_button_state(interaction.user.id)
@@ -370,65 +424,6 @@ class UpcomingReleasesView(PaginatorView):
         await interaction.response.edit_message(embed=self.embeds[self.current_page], view=self)
 
 
-class GameSelectButton(discord.ui.Button):
-    """Button shown in a list panel to open the detailed view for a game."""
-
-    def __init__(self, index: int, label: str, parent_view: "WishlistListPanelView"):
-        # Use a compact label (Discord limits apply) and secondary style
-        super().__init__(label=label, style=discord.ButtonStyle.secondary)
-        self.index = index
-        self.parent_view = parent_view
-
-    async def callback(self, interaction: Interaction):
-        # Only use the game data from the parent view
-        try:
-            games = getattr(self.parent_view, "games", [])
-            if not games or self.index < 0 or self.index >= len(games):
-                await interaction.response.send_message("❌ Jeu introuvable.", ephemeral=True)
-                return
-
-            game = games[self.index]
-
-            # Use the existing GameEmbedView to display details and wishlist actions
-            view = GameEmbedView(game, self.parent_view.wishlist_manager)
-
-            # Build embed similar to GameEmbedView's expectations (the view will render full details)
-            embed = discord.Embed(title=game.get("name", "Titre inconnu"), color=0xFF69B4)
-            # Show release date if available
-            fr_date = None
-            ts = game.get("first_release_date") or game.get("first_release_date")
-            if ts:
-                try:
-                    fr_date = datetime.fromtimestamp(int(ts)).strftime("%d %B %Y")
-                except Exception:
-                    fr_date = None
-
-            if fr_date:
-                embed.add_field(name="📅 Date de sortie", value=fr_date, inline=False)
-
-            # Link to IGDB when slug available
-            slug = game.get("slug") or game.get("slug")
-            if slug:
-                embed.add_field(name="🔗 Lien IGDB", value=f"[Voir sur IGDB](https://www.igdb.com/games/{slug})", inline=False)
-
-            cover_url = game.get("cover_url") or (game.get("cover", {}) or {}).get("url")
-            if cover_url:
-                if cover_url.startswith("//"):
-                    cover_url = f"https:{cover_url}"
-                cover_url = cover_url.replace("t_thumb", "t_cover_big")
-                embed.set_image(url=cover_url)
-
-            # Send ephemeral detailed view so the invoker gets the interactive wishlist buttons
-            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
-
-        except Exception as e:
-            logger.error(f"Error opening game detail from list: {e}")
-            try:
-                await interaction.response.send_message("❌ Une erreur est survenue.", ephemeral=True)
-            except Exception:
-                pass
-
-
 class GameSelect(discord.ui.Select):
     """Select menu for choosing a game from a page."""
 
@@ -499,8 +494,16 @@ class WishlistListPanelView(View):
 
         # Default sort direction: True == descending (most recent/unknown first) to match previous behaviour
         self.sort_descending = True
-
-        # Initialize buttons for the first page and add navigational buttons (decorated methods exist below)
+        # Sorted copies per direction; the source list never changes, so each is sorted at most once
+        self._sorted_games: Dict[bool, List[Dict[str, Any]]] = {}
+        # Release timestamps normalized once, shared by both sort directions
+        self._ts_keys: List[int] = [self._release_ts(g) for g in self.original_games]
+        # (sort_descending, page) -> embed; the panel only lives PAGINATION_TIMEOUT, so "now" is fixed at creation
+        self._embed_cache: Dict[Tuple[bool, int], discord.Embed] = {}
+        self._now_ts = int(time.time())
+
+        # Attach the select and navigational buttons once (decorated methods exist below), then fill the first page
+        self._attach_controls()
         self._build_page_buttons()
 
     def _release_ts(self, g: Dict[str, Any]) -> int:
@@ -516,75 +519,80 @@ class WishlistListPanelView(View):
 
     def _sort_games(self) -> None:
         """Sort self.games from the original list according to current sort direction."""
-        self.games = sorted(self.original_games, key=self._release_ts, reverse=bool(self.sort_descending))
+        descending = bool(self.sort_descending)
+        games = self._sorted_games.get(descending)
+        if games is None:
+            # sorted(reverse=True) rather than reversing the ascending copy keeps ties in source order
+            order = sorted(range(len(self._ts_keys)), key=self._ts_keys.__getitem__, reverse=descending)
+            games = [self.original_games[i] for i in order]
+            self._sorted_games[descending] = games
+        self.games = games
         self.max_page = max(0, (len(self.games) - 1) // self.page_size)
 
-    def _build_page_buttons(self):
-        """(Re)build the GameSelectButtons for the current page and attach nav buttons."""
-        # Remove all items and re-add page-specific buttons + nav controls
+    def _attach_controls(self) -> None:
+        """Attach the page select and the controls once, in display order."""
         self.clear_items()
+        # A select needs at least one option; an empty wishlist only gets the controls
+        if self.original_games:
+            self._select = GameSelect(options=[discord.SelectOption(label="-", value="0")], parent_view=self)
+            self.add_item(self._select)
+        else:
+            self._select = None
+        # decorated buttons are attributes on the instance
+        for item in (self.sort_button, self.previous_button, self.next_button, self.close_button):
+            self.add_item(item)
 
+    def _build_page_buttons(self):
+        """Refresh the page select options and control states in place for the current page."""
         # Ensure games are sorted according to current toggle before building page
         self._sort_games()
 
         start = self.current_page * self.page_size
         end = start + self.page_size
 
-        # Build a single select menu for the page to reduce UI clutter
-        options = []
-        for i, game in enumerate(self.games[start:end], start=start):
-            name = game.get("name", "Jeu")
-            label = f"{i+1}. {name}"
-            if len(label) > 100:
-                label = label[:97] + "..."
-            # value will be the absolute index so callback can open the right game
-            options.append(discord.SelectOption(label=label, value=str(i)))
-
-        # Create and add the Select component (single-select)
-        if options:
-            select = GameSelect(options=options, parent_view=self)
-            self.add_item(select)
-
-        # Add the sort toggle button and navigational buttons (these are bound to instance attributes by decorator)
-        # Make sure the sort button label matches current state
-        try:
-            self.sort_button.label = "Trier: Décroissant" if self.sort_descending else "Trier: Croissant"
-        except Exception:
-            pass
+        # Single select menu for the page to reduce UI clutter; only its options change between pages
+        if self._select is not None:
+            options = []
+            for i, game in enumerate(self.games[start:end], start=start):
+                name = game.get("name", "Jeu")
+                label = f"{i+1}. {name}"
+                if len(label) > 100:
+                    label = label[:97] + "..."
+                # value will be the absolute index so callback can open the right game
+                options.append(discord.SelectOption(label=label, value=str(i)))
+            self._select.options = options
 
-        try:
-            # decorated buttons are attributes on the instance
-            self.add_item(self.sort_button)
-            self.add_item(self.previous_button)
-            self.add_item(self.next_button)
-            self.add_item(self.close_button)
-        except Exception:
-            # If for some reason decorated buttons aren't present, it's non-fatal
-            pass
+        # Make sure the sort button label matches current state
+        self.sort_button.label = "Trier: Décroissant" if self.sort_descending else "Trier: Croissant"
 
         # Update nav button disabled state
-        if hasattr(self, 'previous_button'):
-            self.previous_button.disabled = self.current_page == 0
-        if hasattr(self, 'next_button'):
-            self.next_button.disabled = self.current_page == self.max_page
+        self.previous_button.disabled = self.current_page == 0
+        self.next_button.disabled = self.current_page == self.max_page
     # end _build_page_buttons
 
     def build_page_embed(self, page: int) -> discord.Embed:
         """Return an embed representing the given page of games."""
         page = max(0, min(page, self.max_page))
+        key = (bool(self.sort_descending), page)
+        embed = self._embed_cache.get(key)
+        if embed is None:
+            embed = self._embed_cache[key] = self._render_page_embed(page)
+        return embed
+
+    def _render_page_embed(self, page: int) -> discord.Embed:
         start = page * self.page_size
         end = start + self.page_size
         page_games = self.games[start:end]
 
         description_lines = []
-        now_ts = int(datetime.now().timestamp())
+        now_ts = self._now_ts
         for idx, game in enumerate(page_games, start=start):
             name = game.get("name", "Titre inconnu")
             ts = game.get("first_release_date")
             if ts:
                 try:
                     rel = "(à venir)" if int(ts) >= now_ts else "(déjà sorti)"
-                    date_str = datetime.fromtimestamp(int(ts)).strftime("%d/%m/%Y")
+                    date_str = time.strftime("%d/%m/%Y", time.localtime(int(ts)))
                 except Exception:
                     date_str = "Date inconnue"
                     rel = ""
@@ -2,6 +2,7 @@ from email.mime import base
 import os
 import logging
 import calendar
+import time
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
@@ -10,13 +11,16 @@ import aiosqlite
 import discord
 from discord import app_commands, Interaction
 from discord.ext import commands
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple
 from ui_components import GameEmbedView, EnhancedPaginatorView
 from discord.ui import View, Button
 
 logger = logging.getLogger(__name__)
 
 DB_PATH = "data/wishlist.db"
+MEMBERSHIP_CACHE_TTL = 30  # seconds; every write path below updates or drops its entries
+MEMBERSHIP_CACHE_MAX = 4096
 
 # Read DEV_GUILD_ID
 _DEV_GUILD = os.getenv("DEV_GUILD_ID")
@@ -145,6 +149,19 @@ class WishlistManager(commands.Cog):
         self._refresh_task = None
         self._last_refresh_time = None
         self._last_refresh_summary = None
+        # (user_id, game_id) -> (expires_at monotonic, in_wishlist); page flips and clicks re-ask the same question
+        self._membership_cache: "OrderedDict[Tuple[int, int], Tuple[float, bool]]" = OrderedDict()
+
+    def _remember_membership(self, user_id: int, game_id: int, in_wishlist: bool) -> None:
+        key = (user_id, game_id)
+        self._membership_cache[key] = (time.monotonic() + MEMBERSHIP_CACHE_TTL, in_wishlist)
+        self._membership_cache.move_to_end(key)
+        while len(self._membership_cache) > MEMBERSHIP_CACHE_MAX:
+            self._membership_cache.popitem(last=False)
+
+    def _forget_user_membership(self, user_id: int) -> None:
+        for key in [k for k in self._membership_cache if k[0] == user_id]:
+            del self._membership_cache[key]
 
     async def cog_load(self):
         await self._init_db()
@@ -195,6 +212,7 @@ class WishlistManager(commands.Cog):
             async with aiosqlite.connect(DB_PATH) as db:
                 async with db.execute("SELECT 1 FROM wishlists WHERE user_id = ? AND game_id = ?", (user_id, game_id)) as cursor:
                     if await cursor.fetchone():
+                        self._remember_membership(user_id, game_id, True)
                         return False
 
                 platforms_field = game.get("platforms", [])
@@ -233,6 +251,7 @@ class WishlistManager(commands.Cog):
                     ),
                 )
                 await db.commit()
+                self._remember_membership(user_id, game_id, True)
                 return True
         except Exception as e:
             logger.error(f"Error adding game to wishlist: {e}")
@@ -243,6 +262,7 @@ class WishlistManager(commands.Cog):
             async with aiosqlite.connect(DB_PATH) as db:
                 await db.execute("DELETE FROM wishlists WHERE user_id = ? AND game_id = ?", (user_id, game_id))
                 await db.commit()
+                self._remember_membership(user_id, game_id, False)
                 return True
         except Exception as e:
             logger.error(f"Error removing game from wishlist: {e}")
@@ -254,15 +274,32 @@ class WishlistManager(commands.Cog):
             async with aiosqlite.connect(DB_PATH) as db:
                 await db.execute("DELETE FROM wishlists WHERE user_id = ?", (user_id,))
                 await db.commit()
+                self._forget_user_membership(user_id)
                 return True
         except Exception as e:
             logger.error(f"Error clearing wishlist: {e}")
             return False
 
     async def is_in_wishlist(self, user_id: int, game_id: int) -> bool:
+        """Membership check backed by a short per-(user, game) TTL cache."""
+        cached = self._membership_cache.get((user_id, game_id))
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
         async with aiosqlite.connect(DB_PATH) as db:
             async with db.execute("SELECT 1 FROM wishlists WHERE user_id = ? AND game_id = ?", (user_id, game_id)) as cursor:
-                return bool(await cursor.fetchone())
+                in_wishlist = bool(await cursor.fetchone())
+        self._remember_membership(user_id, game_id, in_wishlist)
+        return in_wishlist
+
+    async def get_user_wishlist_ids(self, user_id: int) -> Set[int]:
+        """Return the IGDB ids in a user's wishlist (empty on error)."""
+        try:
+            async with aiosqlite.connect(DB_PATH) as db:
+                async with db.execute("SELECT game_id FROM wishlists WHERE user_id = ?", (user_id,)) as cursor:
+                    return {row[0] for row in await cursor.fetchall()}
+        except Exception as e:
+            logger.error(f"Error fetching wishlist ids: {e}")
+            return set()
 
     async def get_user_wishlist(self, user_id: int) -> List[Dict[str, Any]]:
         async with aiosqlite.connect(DB_PATH) as db: